@@ -4,23 +4,46 @@ FastAPI Server for N8N Workflow Documentation
 High-performance API with sub-100ms response times.
 """
 
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Request
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import (
+    HTMLResponse,
+    FileResponse,
+    JSONResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from pydantic import BaseModel, field_validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, List, Dict, Any, Tuple
+import asyncio
+import codecs
 import json
 import os
 import re
+import time
 import urllib.parse
 from pathlib import Path
 import uvicorn
-import time
-from collections import defaultdict
 
-from workflow_db import WorkflowDatabase
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the stdlib encoder
+    orjson = None
+
+from background_index import (
+    FAILED,
+    READY,
+    IndexStatus,
+    index_status_path,
+    start_background_indexing,
+)
+from http_cache import CachePolicy, GenerationCacheMiddleware
+from rate_limiter import create_rate_limiter
+from static_assets import PrecompressedStaticFiles, precompressed_file_response
+from workflow_db import WORKFLOW_COLUMNS, AsyncWorkflowDatabase, WorkflowDatabase
+from workflow_diagram import generate_mermaid_diagram
+from workflow_export import WorkflowZipStream
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -29,12 +52,74 @@ app = FastAPI(
     version="2.0.0",
 )
 
-# Security: Rate limiting storage
-rate_limit_storage = defaultdict(list)
-MAX_REQUESTS_PER_MINUTE = 60  # Configure as needed
 
-# Add middleware for performance
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZip that passes already-compressed downloads (ZIP exports) through untouched."""
+
+    def __init__(self, app, excluded_paths=(), **kwargs):
+        super().__init__(app, **kwargs)
+        self.excluded_paths = set(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Security: Rate limiting (sliding window; RATE_LIMIT_BACKEND=sqlite shares it across workers)
+MAX_REQUESTS_PER_MINUTE = int(os.environ.get("RATE_LIMIT_REQUESTS", "60"))
+RATE_LIMIT_WINDOW = float(os.environ.get("RATE_LIMIT_WINDOW", "60"))
+rate_limiter = create_rate_limiter(MAX_REQUESTS_PER_MINUTE, window=RATE_LIMIT_WINDOW)
+
+# Initialize database; request handlers go through the async facade so SQLite
+# queries and file parsing never block the event loop
+db = WorkflowDatabase()
+async_db = AsyncWorkflowDatabase(db)
+# Progress published by the background indexer, for /ready
+index_status = IndexStatus(index_status_path(db.db_path))
+# Seconds between checks of the context/ category files for edits (0 disables)
+CATEGORY_CHECK_INTERVAL = float(os.environ.get("CATEGORY_CHECK_INTERVAL", "30"))
+
+# HTTP caching: catalogue responses only change when the index generation does.
+# Validators are revalidated cheaply, so max-age stays short; routes that set
+# their own ETag (workflow detail, download, diagram) are not listed here.
+CATALOGUE_CACHE_CONTROL = (
+    f"public, max-age={int(os.environ.get('HTTP_CACHE_MAX_AGE', '60'))}"
+)
+HTTP_CACHE_POLICIES = [
+    CachePolicy(r"^/api/stats$", CATALOGUE_CACHE_CONTROL),
+    CachePolicy(r"^/api/workflows$", CATALOGUE_CACHE_CONTROL),
+    CachePolicy(r"^/api/workflows/category/[^/]+$", CATALOGUE_CACHE_CONTROL),
+    CachePolicy(r"^/api/integrations$", CATALOGUE_CACHE_CONTROL),
+    CachePolicy(r"^/api/categories$", CATALOGUE_CACHE_CONTROL),
+    CachePolicy(r"^/api/category-mappings$", CATALOGUE_CACHE_CONTROL),
+]
+
+# Seconds the cache validators' copy of the index state is reused before re-reading
+INDEX_STATE_TTL = 1.0
+_index_state: Dict[str, Any] = {"value": None, "read_at": 0.0}
+
+
+async def cached_index_state() -> Tuple[int, Optional[str], Optional[str]]:
+    """Index state for the HTTP cache, re-read off the event loop once per TTL."""
+    now = time.monotonic()
+    if _index_state["value"] is None or now - _index_state["read_at"] >= INDEX_STATE_TTL:
+        _index_state["value"] = await async_db.run(db.get_index_state)
+        _index_state["read_at"] = now
+    return _index_state["value"]
+
+
+# Add middleware for performance (inner to outer: caching, compression, CORS,
+# so 304s still get CORS headers)
+app.add_middleware(
+    GenerationCacheMiddleware,
+    index_state=cached_index_state,
+    policies=HTTP_CACHE_POLICIES,
+)
+app.add_middleware(
+    SelectiveGZipMiddleware, minimum_size=1000, excluded_paths={"/api/workflows/export"}
+)
 
 # Security: Configure CORS properly - restrict origins in production
 # For local development, you can use localhost
@@ -55,26 +140,23 @@ app.add_middleware(
     allow_headers=["Content-Type", "Authorization"],  # Security fix: Restrict headers
 )
 
-# Initialize database
-db = WorkflowDatabase()
+
+def generate_and_store_diagram(file_path: Path, detail: str = "full") -> str:
+    """Generate a workflow's Mermaid diagram and cache it (blocking; run it through async_db.run)."""
+    buffer, _ = db.read_workflow_file(str(file_path))
+    data = json.loads(buffer)
+
+    diagram = generate_mermaid_diagram(
+        data.get("nodes", []), data.get("connections", {}), detail
+    )
+    db.store_diagram(db.hash_content(buffer), diagram, detail)
+    return diagram
 
 
 # Security: Helper function for rate limiting
 def check_rate_limit(client_ip: str) -> bool:
     """Check if client has exceeded rate limit."""
-    current_time = time.time()
-    # Clean old entries
-    rate_limit_storage[client_ip] = [
-        timestamp
-        for timestamp in rate_limit_storage[client_ip]
-        if current_time - timestamp < 60
-    ]
-    # Check rate limit
-    if len(rate_limit_storage[client_ip]) >= MAX_REQUESTS_PER_MINUTE:
-        return False
-    # Add current request
-    rate_limit_storage[client_ip].append(current_time)
-    return True
+    return rate_limiter.allow(client_ip)
 
 
 # Security: Helper function to validate and sanitize filenames
@@ -136,19 +218,107 @@ def validate_filename(filename: str) -> bool:
     return True
 
 
-# Startup function to verify database
-@app.on_event("startup")
-async def startup_event():
-    """Verify database connectivity on startup."""
+# Conditional requests: validators derived from the indexed file_hash. They are
+# weak because GZipMiddleware may serve the same representation gzip-encoded.
+def workflow_etag(file_hash: str, variant: str = "") -> str:
+    """Build the (weak) ETag for a workflow representation."""
+    return f'W/"{file_hash}-{variant}"' if variant else f'W/"{file_hash}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return True if the request's If-None-Match header matches etag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 8.8.3.2), as If-None-Match requires
+    opaque = etag.removeprefix("W/")
+    candidates = (tag.strip() for tag in header.split(","))
+    return any(tag.removeprefix("W/") == opaque for tag in candidates)
+
+
+def read_workflow_bytes(file_path: Path) -> bytes:
+    """Read a workflow file as raw JSON bytes (blocking; run it through async_db.run)."""
+    raw = file_path.read_bytes()
+    # A BOM is fine at the start of a document but not inside the response envelope
+    if raw.startswith(codecs.BOM_UTF8):
+        raw = raw[len(codecs.BOM_UTF8) :]
+    return raw
+
+
+def readiness() -> Dict[str, Any]:
+    """Report whether a complete index can be served, with the indexer's progress.
+
+    An index is complete once a run has recorded its statistics snapshot
+    (last_indexed); a cold index commits in batches, so its rows are visible
+    long before that. A reindex over a complete index keeps the server ready.
+    A database indexed by an older version has workflows but no snapshot yet;
+    it is only trusted while no indexer is running and the last one succeeded.
+    """
+    status = index_status.read() or {}
+    state = status.get("state")
     try:
-        stats = db.get_stats()
-        if stats["total"] == 0:
-            print("⚠️  Warning: No workflows found in database. Run indexing first.")
-        else:
-            print(f"✅ Database connected: {stats['total']} workflows indexed")
+        _, last_indexed, _ = db.get_index_state()
+        servable = last_indexed is not None or (
+            state in (None, READY) and db.has_workflows()
+        )
     except Exception as e:
-        print(f"❌ Database connection failed: {e}")
-        raise
+        return {"ready": False, "status": "unavailable", "error": str(e)}
+
+    report = {
+        "ready": servable,
+        "status": state or (READY if servable else "not indexed"),
+        "last_indexed": last_indexed,
+    }
+    if "total" in status:
+        total = status["total"]
+        report["progress"] = {
+            "done": status["done"],
+            "total": total,
+            "percent": round(100 * status["done"] / total, 1) if total else 100.0,
+        }
+    if state == FAILED:
+        report["error"] = status.get("error")
+    return report
+
+
+def reload_changed_categories():
+    """Pick up edited category files (blocking; run it through async_db.run)."""
+    if not db.categories_changed():
+        return
+    if not db.read_only:
+        db.refresh_categories()
+    else:
+        # Read-only workers never write; an indexing run reloads the categories.
+        # Every worker sees the edit, but only the first one starts an indexer.
+        start_background_indexing(db.db_path)
+
+
+async def watch_category_files():
+    """Poll the category files so running servers see edits without a restart."""
+    while True:
+        await asyncio.sleep(CATEGORY_CHECK_INTERVAL)
+        try:
+            await async_db.run(reload_changed_categories)
+        except Exception as e:
+            print(f"Warning: category reload check failed: {str(e)}")
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Start the category file watcher."""
+    if CATEGORY_CHECK_INTERVAL > 0:
+        app.state.category_watcher = asyncio.create_task(watch_category_files())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the watcher and release the database reader threads and connections."""
+    watcher = getattr(app.state, "category_watcher", None)
+    if watcher is not None:
+        watcher.cancel()
+    async_db.shutdown()
 
 
 # Response models
@@ -180,12 +350,27 @@ class WorkflowSummary(BaseModel):
 
 class SearchResponse(BaseModel):
     workflows: List[WorkflowSummary]
-    total: int
+    total: Optional[int] = None  # None when include_total=false
     page: int
     per_page: int
-    pages: int
+    pages: Optional[int] = None
     query: str
     filters: Dict[str, Any]
+    next_cursor: Optional[str] = None  # Opaque keyset cursor for the next page
+
+
+# Batch fetch: one request, one rate-limit check and one metadata query for many
+# workflows (e.g. a dashboard opening a page of cards)
+MAX_BATCH_SIZE = 100
+BATCH_METADATA_FIELDS = set(WORKFLOW_COLUMNS)
+
+
+class BatchWorkflowRequest(BaseModel):
+    filenames: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+    fields: Optional[List[str]] = Field(
+        None, description="Metadata fields to return (default: all)"
+    )
+    include_raw: bool = Field(True, description="Include each workflow's raw JSON")
 
 
 class StatsResponse(BaseModel):
@@ -199,8 +384,52 @@ class StatsResponse(BaseModel):
     last_indexed: str
 
 
+# Fast serialization path for listing endpoints: the indexer stores each workflow's
+# WorkflowSummary as JSON, so pages are concatenated without decoding any row; the
+# response_model still documents the schema
+def dumps_json(value: Any) -> bytes:
+    """Encode to compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def search_response(
+    summaries: List[str],
+    total: Optional[int],
+    page: int,
+    per_page: int,
+    query: str,
+    filters: Dict[str, Any],
+    next_cursor: Optional[str],
+) -> Response:
+    """Build a SearchResponse body from pre-rendered workflow summary JSON."""
+    # Ceiling division
+    pages = (total + per_page - 1) // per_page if total is not None else None
+    rest = dumps_json(
+        {
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "pages": pages,
+            "query": query,
+            "filters": filters,
+            "next_cursor": next_cursor,
+        }
+    )
+    body = b"".join(
+        (
+            b'{"workflows":[',
+            ",".join(summaries).encode("utf-8"),
+            b"],",
+            rest[1:],
+        )
+    )
+    return Response(content=body, media_type="application/json")
+
+
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Serve the main documentation page."""
     static_dir = Path("static")
     index_file = static_dir / "index.html"
@@ -216,20 +445,29 @@ async def root():
         </body></html>
         """
         )
-    return FileResponse(str(index_file))
+    return precompressed_file_response(
+        str(index_file), request.headers.get("accept-encoding", "")
+    )
 
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Liveness check: answers as soon as the server is up, without touching the database."""
     return {"status": "healthy", "message": "N8N Workflow API is running"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check: 200 once an index can be served, 503 before; includes indexing progress."""
+    report = await async_db.run(readiness)
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+
 @app.get("/api/stats", response_model=StatsResponse)
 async def get_stats():
     """Get workflow database statistics."""
     try:
-        stats = db.get_stats()
+        stats = await async_db.get_stats()
         return StatsResponse(**stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching stats: {str(e)}")
@@ -241,70 +479,214 @@ async def search_workflows(
     trigger: str = Query("all", description="Filter by trigger type"),
     complexity: str = Query("all", description="Filter by complexity"),
     active_only: bool = Query(False, description="Show only active workflows"),
+    category: str = Query("all", description="Filter by workflow category"),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor from a previous response (ignores page)"
+    ),
+    include_total: bool = Query(True, description="Count all matching workflows"),
 ):
-    """Search and filter workflows with pagination."""
+    """Search and filter workflows with page-number or cursor pagination."""
     try:
         offset = (page - 1) * per_page
 
-        workflows, total = db.search_workflows(
-            query=q,
-            trigger_filter=trigger,
-            complexity_filter=complexity,
-            active_only=active_only,
-            limit=per_page,
-            offset=offset,
-        )
-
-        # Convert to Pydantic models with error handling
-        workflow_summaries = []
-        for workflow in workflows:
-            try:
-                # Remove extra fields that aren't in the model
-                clean_workflow = {
-                    "id": workflow.get("id"),
-                    "filename": workflow.get("filename", ""),
-                    "name": workflow.get("name", ""),
-                    "active": workflow.get("active", False),
-                    "description": workflow.get("description", ""),
-                    "trigger_type": workflow.get("trigger_type", "Manual"),
-                    "complexity": workflow.get("complexity", "low"),
-                    "node_count": workflow.get("node_count", 0),
-                    "integrations": workflow.get("integrations", []),
-                    "tags": workflow.get("tags", []),
-                    "created_at": workflow.get("created_at"),
-                    "updated_at": workflow.get("updated_at"),
-                }
-                workflow_summaries.append(WorkflowSummary(**clean_workflow))
-            except Exception as e:
-                print(
-                    f"Error converting workflow {workflow.get('filename', 'unknown')}: {e}"
-                )
-                # Continue with other workflows instead of failing completely
-                continue
-
-        pages = (total + per_page - 1) // per_page  # Ceiling division
-
-        return SearchResponse(
-            workflows=workflow_summaries,
-            total=total,
-            page=page,
-            per_page=per_page,
-            pages=pages,
-            query=q,
-            filters={
+        try:
+            workflows, total, next_cursor = await async_db.search_workflows_page(
+                query=q,
+                trigger_filter=trigger,
+                complexity_filter=complexity,
+                active_only=active_only,
+                category_filter=category,
+                limit=per_page,
+                offset=offset,
+                cursor=cursor,
+                include_total=include_total,
+                summaries=True,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return search_response(
+            workflows,
+            total,
+            page,
+            per_page,
+            q,
+            {
                 "trigger": trigger,
                 "complexity": complexity,
                 "active_only": active_only,
+                "category": category,
             },
+            next_cursor,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error searching workflows: {str(e)}"
         )
 
 
+def resolve_workflow_paths(filenames: List[str]) -> Dict[str, Optional[Path]]:
+    """Resolve many workflow files in one call (blocking; run it through async_db.run)."""
+    return {filename: db.resolve_workflow_path(filename) for filename in filenames}
+
+
+@app.post("/api/workflows/batch")
+async def get_workflows_batch(batch: BatchWorkflowRequest, request: Request):
+    """Get metadata and raw JSON for many workflows in one streamed response.
+
+    Workflows are returned in request order as {"filename", "metadata", "raw_json"};
+    raw_json is null if the file has gone missing. Filenames that are not indexed
+    are listed under "missing".
+    """
+    try:
+        # Security: Validate filenames to prevent path traversal
+        invalid = [f for f in batch.filenames if not validate_filename(f)]
+        if invalid:
+            print(f"Security: Blocked invalid filenames in batch request: {invalid}")
+            raise HTTPException(status_code=400, detail="Invalid filename format")
+
+        if batch.fields is not None:
+            unknown = sorted(set(batch.fields) - BATCH_METADATA_FIELDS)
+            if unknown:
+                raise HTTPException(
+                    status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
+                )
+
+        # Security: Rate limiting, once for the whole batch
+        client_ip = request.client.host if request.client else "unknown"
+        if not check_rate_limit(client_ip):
+            raise HTTPException(
+                status_code=429, detail="Rate limit exceeded. Please try again later."
+            )
+
+        filenames = list(dict.fromkeys(batch.filenames))
+        metadata = await async_db.get_workflows(filenames)
+        found = [f for f in filenames if f in metadata]
+        missing = [f for f in filenames if f not in metadata]
+        paths = (
+            await async_db.run(resolve_workflow_paths, found) if batch.include_raw else {}
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error loading workflows: {str(e)}"
+        )
+
+    async def stream_workflows():
+        yield b'{"workflows":['
+        for i, filename in enumerate(found):
+            workflow_meta = metadata[filename]
+            if batch.fields is not None:
+                workflow_meta = {field: workflow_meta.get(field) for field in batch.fields}
+            parts = [
+                b"," if i else b"",
+                b'{"filename":',
+                dumps_json(filename),
+                b',"metadata":',
+                dumps_json(workflow_meta),
+            ]
+            if batch.include_raw:
+                # Raw bytes are spliced in as-is, like the single-workflow endpoint
+                raw_json = b"null"
+                if paths.get(filename):
+                    try:
+                        raw_json = await async_db.run(
+                            read_workflow_bytes, paths[filename]
+                        )
+                    except OSError as e:
+                        print(f"Warning: could not read {filename}: {str(e)}")
+                parts += [b',"raw_json":', raw_json]
+            parts.append(b"}")
+            yield b"".join(parts)
+        yield b'],"missing":' + dumps_json(missing) + b"}"
+
+    return StreamingResponse(stream_workflows(), media_type="application/json")
+
+
+# Export walks the result set in keyset pages and compresses a few files per
+# thread-pool hop, so memory stays flat even for the whole catalogue
+EXPORT_PAGE_SIZE = 200
+EXPORT_FILES_PER_CHUNK = 20
+
+
+@app.get("/api/workflows/export")
+async def export_workflows(
+    request: Request,
+    q: str = Query("", description="Search query"),
+    trigger: str = Query("all", description="Filter by trigger type"),
+    complexity: str = Query("all", description="Filter by complexity"),
+    active_only: bool = Query(False, description="Show only active workflows"),
+    category: str = Query("all", description="Filter by workflow category"),
+):
+    """Stream a ZIP of every workflow matching the /api/workflows filters."""
+    filters = {
+        "query": q,
+        "trigger_filter": trigger,
+        "complexity_filter": complexity,
+        "active_only": active_only,
+        "category_filter": category,
+        "limit": EXPORT_PAGE_SIZE,
+        "include_total": False,
+        "use_cache": False,
+    }
+    try:
+        # Security: Rate limiting, once for the whole export
+        client_ip = request.client.host if request.client else "unknown"
+        if not check_rate_limit(client_ip):
+            raise HTTPException(
+                status_code=429, detail="Rate limit exceeded. Please try again later."
+            )
+
+        # Fetch the first page up front so query errors still get a status code
+        first_page = await async_db.search_workflows_page(**filters)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error exporting workflows: {str(e)}"
+        )
+
+    async def stream_archive():
+        archive = WorkflowZipStream()
+        workflows, _, next_cursor = first_page
+        while True:
+            filenames = [workflow["filename"] for workflow in workflows]
+            paths = await async_db.run(resolve_workflow_paths, filenames)
+            # Keep the repository's folder layout inside the archive; the listing
+            # rows carry no path, so name entries after the resolved files
+            entries = [
+                (path, db.relative_workflow_path(str(path)))
+                for path in (paths.get(filename) for filename in filenames)
+                if path
+            ]
+            for start in range(0, len(entries), EXPORT_FILES_PER_CHUNK):
+                chunk = await async_db.run(
+                    archive.add_files, entries[start : start + EXPORT_FILES_PER_CHUNK]
+                )
+                if chunk:
+                    yield chunk
+            if not next_cursor:
+                break
+            workflows, _, next_cursor = await async_db.search_workflows_page(
+                cursor=next_cursor, **filters
+            )
+        yield await async_db.run(archive.close)
+
+    return StreamingResponse(
+        stream_archive(),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": 'attachment; filename="n8n-workflows.zip"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
 @app.get("/api/workflows/{filename}")
 async def get_workflow_detail(filename: str, request: Request):
     """Get detailed workflow information including raw JSON."""
@@ -322,33 +704,18 @@ async def get_workflow_detail(filename: str, request: Request):
             )
 
         # Get workflow metadata from database
-        workflows, _ = db.search_workflows(f'filename:"{filename}"', limit=1)
-        if not workflows:
+        workflow_meta = await async_db.get_workflow(filename)
+        if not workflow_meta:
             raise HTTPException(
                 status_code=404, detail="Workflow not found in database"
             )
 
-        workflow_meta = workflows[0]
+        etag = workflow_etag(workflow_meta["file_hash"], "detail")
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
 
-        # Load raw JSON from file with security checks
-        workflows_path = Path("workflows").resolve()
-
-        # Find the file safely
-        matching_file = None
-        for subdir in workflows_path.iterdir():
-            if subdir.is_dir():
-                target_file = subdir / filename
-                if target_file.exists() and target_file.is_file():
-                    # Verify the file is actually within workflows directory
-                    try:
-                        target_file.resolve().relative_to(workflows_path)
-                        matching_file = target_file
-                        break
-                    except ValueError:
-                        print(
-                            f"Security: Blocked access to file outside workflows: {target_file}"
-                        )
-                        continue
+        # Locate the file through the indexed filename -> path map
+        matching_file = await async_db.run(db.resolve_workflow_path, filename)
 
         if not matching_file:
             print(f"Warning: File {filename} not found in workflows directory")
@@ -357,10 +724,24 @@ async def get_workflow_detail(filename: str, request: Request):
                 detail=f"Workflow file '{filename}' not found on filesystem",
             )
 
-        with open(matching_file, "r", encoding="utf-8") as f:
-            raw_json = json.load(f)
+        # Splice the stored JSON bytes into the envelope instead of parsing and
+        # re-serializing the whole workflow
+        raw_json = await async_db.run(read_workflow_bytes, matching_file)
+        body = b"".join(
+            (
+                b'{"metadata":',
+                json.dumps(workflow_meta, separators=(",", ":")).encode("utf-8"),
+                b',"raw_json":',
+                raw_json,
+                b"}",
+            )
+        )
 
-        return {"metadata": workflow_meta, "raw_json": raw_json}
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"ETag": etag, "Cache-Control": "no-cache"},
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -383,45 +764,28 @@ async def download_workflow(filename: str, request: Request):
                 status_code=429, detail="Rate limit exceeded. Please try again later."
             )
 
-        # Only search within the workflows directory
-        workflows_path = Path("workflows").resolve()  # Get absolute path
-
-        # Find the file safely
-        json_files = []
-        for subdir in workflows_path.iterdir():
-            if subdir.is_dir():
-                target_file = subdir / filename
-                if target_file.exists() and target_file.is_file():
-                    # Verify the file is actually within workflows directory (defense in depth)
-                    try:
-                        target_file.resolve().relative_to(workflows_path)
-                        json_files.append(target_file)
-                    except ValueError:
-                        # File is outside workflows directory
-                        print(
-                            f"Security: Blocked access to file outside workflows: {target_file}"
-                        )
-                        continue
+        # Locate the file through the indexed filename -> path map
+        file_path = await async_db.run(db.resolve_workflow_path, filename)
 
-        if not json_files:
+        if not file_path:
             print(f"File {filename} not found in workflows directory")
             raise HTTPException(
                 status_code=404, detail=f"Workflow file '{filename}' not found"
             )
 
-        file_path = json_files[0]
-
-        # Final security check: Ensure file is within workflows directory
-        try:
-            file_path.resolve().relative_to(workflows_path)
-        except ValueError:
-            print(
-                f"Security: Blocked final attempt to access file outside workflows: {file_path}"
-            )
-            raise HTTPException(status_code=403, detail="Access denied")
+        headers = {"Cache-Control": "no-cache"}
+        workflow_meta = await async_db.get_workflow(filename)
+        if workflow_meta:
+            etag = workflow_etag(workflow_meta["file_hash"])
+            if etag_matches(request, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            headers["ETag"] = etag
 
         return FileResponse(
-            str(file_path), media_type="application/json", filename=filename
+            str(file_path),
+            media_type="application/json",
+            filename=filename,
+            headers=headers,
         )
     except HTTPException:
         raise
@@ -433,7 +797,15 @@ async def download_workflow(filename: str, request: Request):
 
 
 @app.get("/api/workflows/{filename}/diagram")
-async def get_workflow_diagram(filename: str, request: Request):
+async def get_workflow_diagram(
+    filename: str,
+    request: Request,
+    detail: str = Query(
+        "full",
+        pattern="^(full|compact|overview)$",
+        description="Level of detail; large workflows degrade to coarser levels",
+    ),
+):
     """Get Mermaid diagram code for workflow visualization."""
     try:
         # Security: Validate filename to prevent path traversal
@@ -448,25 +820,23 @@ async def get_workflow_diagram(filename: str, request: Request):
                 status_code=429, detail="Rate limit exceeded. Please try again later."
             )
 
-        # Only search within the workflows directory
-        workflows_path = Path("workflows").resolve()
+        # Serve the diagram precomputed at index time when there is one
+        headers = {"Cache-Control": "no-cache"}
+        workflow_meta = await async_db.get_workflow(filename)
+        if workflow_meta:
+            etag = workflow_etag(workflow_meta["file_hash"], f"diagram-{detail}")
+            if etag_matches(request, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            headers["ETag"] = etag
+
+            diagram = await async_db.run(
+                db.get_diagram, workflow_meta["file_hash"], detail
+            )
+            if diagram is not None:
+                return JSONResponse({"diagram": diagram}, headers=headers)
 
-        # Find the file safely
-        matching_file = None
-        for subdir in workflows_path.iterdir():
-            if subdir.is_dir():
-                target_file = subdir / filename
-                if target_file.exists() and target_file.is_file():
-                    # Verify the file is actually within workflows directory
-                    try:
-                        target_file.resolve().relative_to(workflows_path)
-                        matching_file = target_file
-                        break
-                    except ValueError:
-                        print(
-                            f"Security: Blocked access to file outside workflows: {target_file}"
-                        )
-                        continue
+        # Fallback: generate from the file and cache it under its content hash
+        matching_file = await async_db.run(db.resolve_workflow_path, filename)
 
         if not matching_file:
             print(f"Warning: File {filename} not found in workflows directory")
@@ -475,16 +845,9 @@ async def get_workflow_diagram(filename: str, request: Request):
                 detail=f"Workflow file '{filename}' not found on filesystem",
             )
 
-        with open(matching_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        nodes = data.get("nodes", [])
-        connections = data.get("connections", {})
+        diagram = await async_db.run(generate_and_store_diagram, matching_file, detail)
 
-        # Generate Mermaid diagram
-        diagram = generate_mermaid_diagram(nodes, connections)
-
-        return {"diagram": diagram}
+        return JSONResponse({"diagram": diagram}, headers=headers)
     except HTTPException:
         raise
     except json.JSONDecodeError as e:
@@ -499,80 +862,8 @@ async def get_workflow_diagram(filename: str, request: Request):
         )
 
 
-def generate_mermaid_diagram(nodes: List[Dict], connections: Dict) -> str:
-    """Generate Mermaid.js flowchart code from workflow nodes and connections."""
-    if not nodes:
-        return "graph TD\n  EmptyWorkflow[No nodes found in workflow]"
-
-    # Create mapping for node names to ensure valid mermaid IDs
-    mermaid_ids = {}
-    for i, node in enumerate(nodes):
-        node_id = f"node{i}"
-        node_name = node.get("name", f"Node {i}")
-        mermaid_ids[node_name] = node_id
-
-    # Start building the mermaid diagram
-    mermaid_code = ["graph TD"]
-
-    # Add nodes with styling
-    for node in nodes:
-        node_name = node.get("name", "Unnamed")
-        node_id = mermaid_ids[node_name]
-        node_type = node.get("type", "").replace("n8n-nodes-base.", "")
-
-        # Determine node style based on type
-        style = ""
-        if any(x in node_type.lower() for x in ["trigger", "webhook", "cron"]):
-            style = "fill:#b3e0ff,stroke:#0066cc"  # Blue for triggers
-        elif any(x in node_type.lower() for x in ["if", "switch"]):
-            style = "fill:#ffffb3,stroke:#e6e600"  # Yellow for conditional nodes
-        elif any(x in node_type.lower() for x in ["function", "code"]):
-            style = "fill:#d9b3ff,stroke:#6600cc"  # Purple for code nodes
-        elif "error" in node_type.lower():
-            style = "fill:#ffb3b3,stroke:#cc0000"  # Red for error handlers
-        else:
-            style = "fill:#d9d9d9,stroke:#666666"  # Gray for other nodes
-
-        # Add node with label (escaping special characters)
-        clean_name = node_name.replace('"', "'")
-        clean_type = node_type.replace('"', "'")
-        label = f"{clean_name}<br>({clean_type})"
-        mermaid_code.append(f'  {node_id}["{label}"]')
-        mermaid_code.append(f"  style {node_id} {style}")
-
-    # Add connections between nodes
-    for source_name, source_connections in connections.items():
-        if source_name not in mermaid_ids:
-            continue
-
-        if isinstance(source_connections, dict) and "main" in source_connections:
-            main_connections = source_connections["main"]
-
-            for i, output_connections in enumerate(main_connections):
-                if not isinstance(output_connections, list):
-                    continue
-
-                for connection in output_connections:
-                    if not isinstance(connection, dict) or "node" not in connection:
-                        continue
-
-                    target_name = connection["node"]
-                    if target_name not in mermaid_ids:
-                        continue
-
-                    # Add arrow with output index if multiple outputs
-                    label = f" -->|{i}| " if len(main_connections) > 1 else " --> "
-                    mermaid_code.append(
-                        f"  {mermaid_ids[source_name]}{label}{mermaid_ids[target_name]}"
-                    )
-
-    # Format the final mermaid diagram code
-    return "\n".join(mermaid_code)
-
-
 @app.post("/api/reindex")
 async def reindex_workflows(
-    background_tasks: BackgroundTasks,
     request: Request,
     force: bool = False,
     admin_token: Optional[str] = Query(None, description="Admin authentication token"),
@@ -602,14 +893,11 @@ async def reindex_workflows(
         print(f"Security: Unauthorized reindex attempt from {client_ip}")
         raise HTTPException(status_code=401, detail="Invalid authentication token")
 
-    def run_indexing():
-        try:
-            db.index_all_workflows(force_reindex=force)
-            print(f"Reindexing completed successfully (requested by {client_ip})")
-        except Exception as e:
-            print(f"Error during reindexing: {e}")
-
-    background_tasks.add_task(run_indexing)
+    # A separate process does the writing, so read-only workers can trigger it too;
+    # progress is reported by /ready
+    if start_background_indexing(db.db_path, force_reindex=force) is None:
+        raise HTTPException(status_code=409, detail="Indexing is already in progress")
+    print(f"Reindexing started (requested by {client_ip})")
     return {"message": "Reindexing started in background", "requested_by": client_ip}
 
 
@@ -617,7 +905,7 @@ async def reindex_workflows(
 async def get_integrations():
     """Get list of all unique integrations."""
     try:
-        stats = db.get_stats()
+        stats = await async_db.get_stats()
         # For now, return basic info. Could be enhanced to return detailed integration stats
         return {"integrations": [], "count": stats["unique_integrations"]}
     except Exception as e:
@@ -630,32 +918,11 @@ async def get_integrations():
 async def get_categories():
     """Get available workflow categories for filtering."""
     try:
-        # Try to load from the generated unique categories file
-        categories_file = Path("context/unique_categories.json")
-        if categories_file.exists():
-            with open(categories_file, "r", encoding="utf-8") as f:
-                categories = json.load(f)
-            return {"categories": categories}
-        else:
-            # Fallback: extract categories from search_categories.json
-            search_categories_file = Path("context/search_categories.json")
-            if search_categories_file.exists():
-                with open(search_categories_file, "r", encoding="utf-8") as f:
-                    search_data = json.load(f)
-
-                unique_categories = set()
-                for item in search_data:
-                    if item.get("category"):
-                        unique_categories.add(item["category"])
-                    else:
-                        unique_categories.add("Uncategorized")
-
-                categories = sorted(list(unique_categories))
-                return {"categories": categories}
-            else:
-                # Last resort: return basic categories
-                return {"categories": ["Uncategorized"]}
-
+        categories = await async_db.get_categories()
+        return Response(
+            content=dumps_json({"categories": categories}),
+            media_type="application/json",
+        )
     except Exception as e:
         print(f"Error loading categories: {e}")
         raise HTTPException(
@@ -667,23 +934,10 @@ async def get_categories():
 async def get_category_mappings():
     """Get filename to category mappings for client-side filtering."""
     try:
-        search_categories_file = Path("context/search_categories.json")
-        if not search_categories_file.exists():
-            return {"mappings": {}}
-
-        with open(search_categories_file, "r", encoding="utf-8") as f:
-            search_data = json.load(f)
-
-        # Convert to a simple filename -> category mapping
-        mappings = {}
-        for item in search_data:
-            filename = item.get("filename")
-            category = item.get("category") or "Uncategorized"
-            if filename:
-                mappings[filename] = category
-
-        return {"mappings": mappings}
-
+        mappings = await async_db.get_category_mappings()
+        return Response(
+            content=dumps_json({"mappings": mappings}), media_type="application/json"
+        )
     except Exception as e:
         print(f"Error loading category mappings: {e}")
         raise HTTPException(
@@ -696,51 +950,38 @@ async def search_workflows_by_category(
     category: str,
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor from a previous response (ignores page)"
+    ),
+    include_total: bool = Query(True, description="Count all matching workflows"),
 ):
-    """Search workflows by service category (messaging, database, ai_ml, etc.)."""
+    """Search workflows by service category (messaging, ai_ml, etc.) or def_categories.json category."""
     try:
         offset = (page - 1) * per_page
 
-        workflows, total = db.search_by_category(
-            category=category, limit=per_page, offset=offset
-        )
-
-        # Convert to Pydantic models with error handling
-        workflow_summaries = []
-        for workflow in workflows:
-            try:
-                clean_workflow = {
-                    "id": workflow.get("id"),
-                    "filename": workflow.get("filename", ""),
-                    "name": workflow.get("name", ""),
-                    "active": workflow.get("active", False),
-                    "description": workflow.get("description", ""),
-                    "trigger_type": workflow.get("trigger_type", "Manual"),
-                    "complexity": workflow.get("complexity", "low"),
-                    "node_count": workflow.get("node_count", 0),
-                    "integrations": workflow.get("integrations", []),
-                    "tags": workflow.get("tags", []),
-                    "created_at": workflow.get("created_at"),
-                    "updated_at": workflow.get("updated_at"),
-                }
-                workflow_summaries.append(WorkflowSummary(**clean_workflow))
-            except Exception as e:
-                print(
-                    f"Error converting workflow {workflow.get('filename', 'unknown')}: {e}"
-                )
-                continue
-
-        pages = (total + per_page - 1) // per_page
-
-        return SearchResponse(
-            workflows=workflow_summaries,
-            total=total,
-            page=page,
-            per_page=per_page,
-            pages=pages,
-            query=f"category:{category}",
-            filters={"category": category},
+        try:
+            workflows, total, next_cursor = await async_db.search_by_category_page(
+                category=category,
+                limit=per_page,
+                offset=offset,
+                cursor=cursor,
+                include_total=include_total,
+                summaries=True,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return search_response(
+            workflows,
+            total,
+            page,
+            per_page,
+            f"category:{category}",
+            {"category": category},
+            next_cursor,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error searching by category: {str(e)}"
@@ -758,7 +999,7 @@ async def global_exception_handler(request, exc):
 # Mount static files AFTER all routes are defined
 static_dir = Path("static")
 if static_dir.exists():
-    app.mount("/static", StaticFiles(directory="static"), name="static")
+    app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
     print(f"✅ Static files mounted from {static_dir.absolute()}")
 else:
     print(f"❌ Warning: Static directory not found at {static_dir.absolute()}")
@@ -771,29 +1012,31 @@ def create_static_directory():
     return static_dir
 
 
-def run_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False):
-    """Run the FastAPI server."""
+def run_server(
+    host: str = "127.0.0.1", port: int = 8000, reload: bool = False, workers: int = 1
+):
+    """Run the FastAPI server (workers != 1 runs the multi-process production mode)."""
     # Ensure static directory exists
     create_static_directory()
 
     # Debug: Check database connectivity
     try:
         stats = db.get_stats()
+        last_indexed = db.get_index_state()[1]
         print(f"✅ Database connected: {stats['total']} workflows found")
-        if stats["total"] == 0:
-            print("🔄 Database is empty. Indexing workflows...")
-            db.index_all_workflows()
-            stats = db.get_stats()
     except Exception as e:
         print(f"❌ Database error: {e}")
-        print("🔄 Attempting to create and index database...")
-        try:
-            db.index_all_workflows()
-            stats = db.get_stats()
-            print(f"✅ Database created: {stats['total']} workflows indexed")
-        except Exception as e2:
-            print(f"❌ Failed to create database: {e2}")
-            stats = {"total": 0}
+        stats = {"total": 0}
+        last_indexed = None
+
+    # Bind right away; /ready reports when the index can be served
+    if stats["total"] == 0:
+        print("🔄 Database is empty. Indexing workflows in the background...")
+        start_background_indexing(db.db_path)
+    elif last_indexed is None:
+        # Indexed by an older version: an incremental run adds the snapshot
+        print("🔄 Database has no statistics snapshot. Updating it in the background...")
+        start_background_indexing(db.db_path)
 
     # Debug: Check static files
     static_path = Path("static")
@@ -808,6 +1051,14 @@ def run_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False):
     print(f"🌐 Server will be available at: http://{host}:{port}")
     print(f"📁 Static files at: http://{host}:{port}/static/")
 
+    if workers != 1 and not reload:
+        from production_server import run_workers
+
+        # The workers import their own read-only copy of this module
+        db.close()
+        run_workers(host=host, port=port, workers=workers, access_log=True)
+        return
+
     uvicorn.run(
         "api_server:app",
         host=host,
@@ -829,7 +1080,15 @@ if __name__ == "__main__":
     parser.add_argument(
         "--reload", action="store_true", help="Enable auto-reload for development"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("MAX_WORKERS", "1")),
+        help="Worker processes (0 = all CPUs, default: $MAX_WORKERS or 1)",
+    )
 
     args = parser.parse_args()
 
-    run_server(host=args.host, port=args.port, reload=args.reload)
+    run_server(
+        host=args.host, port=args.port, reload=args.reload, workers=args.workers
+    )
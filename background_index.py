@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Background Indexing
+Runs the workflow indexer in a separate process so the server can bind and
+answer probes immediately, and publishes its progress for the /ready endpoint.
+
+Progress is kept in a small JSON file next to the database rather than in the
+database itself: a forced reindex writes in one long transaction, and the file
+can be read from every server worker while that transaction is open.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process mode only, nothing to serialize
+    fcntl = None
+
+# Indexer states published in the status file
+STARTING = "starting"
+INDEXING = "indexing"
+READY = "ready"
+FAILED = "failed"
+
+
+def index_status_path(db_path: str) -> str:
+    """Return the status file used for the database at db_path."""
+    return f"{db_path}.status.json"
+
+
+def index_lock_path(db_path: str) -> str:
+    """Return the lock file held by the indexer for the database at db_path."""
+    return f"{db_path}.index.lock"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    return True
+
+
+class IndexStatus:
+    """Indexer progress, written atomically by the indexer and read by the server."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def write(self, state: str, **fields: Any):
+        status = {
+            "state": state,
+            "pid": os.getpid(),
+            "updated_at": datetime.datetime.now().isoformat(),
+            **fields,
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(status, f)
+        os.replace(tmp_path, self.path)
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """Return the last published status, or None if no indexer has run.
+
+        An indexer that died without reporting (killed, out of memory) is
+        reported as failed instead of indexing forever.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                status = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if status.get("state") in (STARTING, INDEXING) and not _pid_alive(
+            status.get("pid", 0)
+        ):
+            status["state"] = FAILED
+            status["error"] = "indexer exited before finishing"
+        return status
+
+    def is_running(self) -> bool:
+        status = self.read()
+        return status is not None and status["state"] in (STARTING, INDEXING)
+
+
+def run_indexing(db_path: str, force_reindex: bool = False, jobs: int = 1) -> int:
+    """Index the workflows into db_path, publishing progress; returns an exit code."""
+    from workflow_db import WorkflowDatabase
+
+    status = IndexStatus(index_status_path(db_path))
+    started_at = datetime.datetime.now().isoformat()
+    status.write(STARTING, started_at=started_at)
+
+    def report(done: int, total: int):
+        status.write(INDEXING, started_at=started_at, done=done, total=total)
+
+    try:
+        # Started from read-only workers too, whose WORKFLOW_DB_READONLY it inherits
+        db = WorkflowDatabase(db_path, read_only=False)
+        stats = db.index_all_workflows(
+            force_reindex=force_reindex, jobs=jobs, progress=report
+        )
+    except Exception as e:
+        print(f"❌ Background indexing failed: {e}")
+        status.write(FAILED, started_at=started_at, error=str(e))
+        return 1
+
+    status.write(
+        READY,
+        started_at=started_at,
+        finished_at=datetime.datetime.now().isoformat(),
+        **stats,
+    )
+    return 0
+
+
+def _acquire_index_lock(db_path: str) -> Optional[int]:
+    """Take the indexer lock without blocking; returns its fd, or None if held."""
+    fd = os.open(index_lock_path(db_path), os.O_RDWR | os.O_CREAT, 0o644)
+    if fcntl is not None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+    return fd
+
+
+def start_background_indexing(
+    db_path: str, force_reindex: bool = False, jobs: int = 1
+) -> Optional[subprocess.Popen]:
+    """Start the indexer as a child process and return without waiting for it.
+
+    A process (not a thread) keeps indexing away from the server's event loop
+    and GIL, and is safe to start from a pre-forking server's master.
+
+    Returns None if an indexer is already running for db_path. The check is an
+    flock that the child inherits and holds until it exits, so concurrent
+    callers (several gunicorn workers seeing the same category edit) start at
+    most one indexer between them.
+    """
+    lock_fd = _acquire_index_lock(db_path)
+    if lock_fd is None:
+        return None
+
+    status = IndexStatus(index_status_path(db_path))
+    # Published before the child exists so /ready never sees a stale state; the
+    # child takes the status over with its own pid once it starts
+    status.write(STARTING, started_at=datetime.datetime.now().isoformat())
+
+    command = [sys.executable, os.path.abspath(__file__), "--db", db_path]
+    command += ["--jobs", str(jobs), "--lock-fd", str(lock_fd)]
+    if force_reindex:
+        command.append("--force")
+    try:
+        process = subprocess.Popen(
+            command, pass_fds=(lock_fd,) if fcntl is not None else ()
+        )
+    except Exception as e:
+        status.write(FAILED, error=str(e))
+        raise
+    finally:
+        # The child's inherited descriptor keeps the lock until it exits
+        os.close(lock_fd)
+
+    def reap():
+        # Wait so the child does not linger as a zombie, and record a crash that
+        # happened before it could publish a status of its own
+        returncode = process.wait()
+        if returncode != 0 and status.is_running():
+            status.write(FAILED, error=f"indexer exited with code {returncode}")
+
+    threading.Thread(target=reap, name="background-index-reaper", daemon=True).start()
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index workflows in the background")
+    parser.add_argument("--db", required=True, help="Database path")
+    parser.add_argument("--force", action="store_true", help="Force reindex all files")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for indexing (0 = all CPUs, default: 1)",
+    )
+    parser.add_argument("--lock-fd", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    # Started by hand rather than by start_background_indexing: take the lock here
+    if args.lock_fd is None and _acquire_index_lock(args.db) is None:
+        print(f"❌ An indexer is already running for {args.db}")
+        return 1
+    return run_indexing(args.db, force_reindex=args.force, jobs=args.jobs)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+HTTP Caching
+ASGI middleware that adds validators to catalogue responses and answers
+conditional requests.
+
+The catalogue only changes when the index changes, so every cacheable response is
+identified by the index generation and build time plus its path and query string. A request whose
+If-None-Match (or If-Modified-Since) still matches gets a 304 before the route
+handler runs. Last-Modified is the time the generation last changed, so a category
+reload, which bumps the generation without reindexing, also moves it forward. Caching is opt-in per route through CachePolicy patterns; responses
+that already carry an ETag (per-workflow endpoints) are left untouched.
+"""
+
+import datetime
+import email.utils
+import hashlib
+import re
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple
+
+
+class CachePolicy:
+    """Cache-Control for the GET routes whose path matches pattern."""
+
+    def __init__(self, pattern: str, cache_control: str):
+        self.pattern = re.compile(pattern)
+        self.cache_control = cache_control
+
+
+def http_date(timestamp: str) -> Optional[str]:
+    """Format an ISO timestamp (local time if naive) as an HTTP date."""
+    try:
+        moment = datetime.datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    return email.utils.formatdate(moment.timestamp(), usegmt=True)
+
+
+def _parse_http_date(value: str) -> Optional[float]:
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class GenerationCacheMiddleware:
+    """Adds ETag/Last-Modified/Cache-Control and answers 304s for matching routes.
+
+    index_state is a coroutine function returning (generation, last_indexed,
+    modified_at), the timestamps as ISO strings or None. It is awaited once per
+    matching request, so it should serve a cached copy rather than query the
+    database on the event loop.
+    """
+
+    def __init__(
+        self,
+        app,
+        index_state: Callable[
+            [], Awaitable[Tuple[int, Optional[str], Optional[str]]]
+        ],
+        policies: Sequence[CachePolicy],
+    ):
+        self.app = app
+        self.index_state = index_state
+        self.policies = list(policies)
+
+    def _policy_for(self, path: str) -> Optional[CachePolicy]:
+        for policy in self.policies:
+            if policy.pattern.match(path):
+                return policy
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        policy = self._policy_for(scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            generation, last_indexed, modified_at = await self.index_state()
+        except Exception as e:
+            print(f"Warning: HTTP cache validators unavailable: {str(e)}")
+            await self.app(scope, receive, send)
+            return
+
+        # Every fresh database starts at generation 1, so the build time keeps
+        # validators from another pod or an earlier deploy from matching; it also
+        # changes on no-op reindexes, which update last_indexed in /api/stats
+        digest = hashlib.blake2b(
+            (last_indexed or "").encode()
+            + b"|"
+            + scope["path"].encode()
+            + b"?"
+            + scope.get("query_string", b""),
+            digest_size=8,
+        ).hexdigest()
+        # Weak: the same representation is served gzip-encoded or not
+        etag = f'W/"g{generation}-{digest}"'
+        last_modified = http_date(modified_at) if modified_at else None
+
+        validators: List[Tuple[bytes, bytes]] = [
+            (b"etag", etag.encode()),
+            (b"cache-control", policy.cache_control.encode()),
+        ]
+        if last_modified:
+            validators.append((b"last-modified", last_modified.encode()))
+
+        if self._not_modified(scope, etag, last_modified):
+            await send(
+                {"type": "http.response.start", "status": 304, "headers": validators}
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_validators(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = list(message.get("headers", []))
+                present = {name.lower() for name, _ in headers}
+                if b"etag" not in present:
+                    headers += [h for h in validators if h[0] not in present]
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_validators)
+
+    @staticmethod
+    def _not_modified(scope, etag: str, last_modified: Optional[str]) -> bool:
+        if_none_match = None
+        if_modified_since = None
+        for name, value in scope.get("headers", []):
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+            elif name == b"if-modified-since":
+                if_modified_since = value.decode("latin-1")
+
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            opaque = etag.removeprefix("W/")
+            return any(
+                tag.strip().removeprefix("W/") == opaque
+                for tag in if_none_match.split(",")
+            )
+        if if_modified_since is not None and last_modified:
+            since = _parse_http_date(if_modified_since)
+            modified = _parse_http_date(last_modified)
+            return since is not None and modified is not None and modified <= since
+        return False
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Production Server
+Runs the API under gunicorn with uvicorn workers so a single host or pod uses
+all of its cores.
+
+The application is imported once in the gunicorn master (preload_app), and the
+database's filename map and category data are loaded there before the workers
+fork, so every worker shares those pages copy-on-write. The workers open the
+index strictly read-only; indexing runs in a separate background process.
+
+The sharing only covers what the master found at startup. On a cold start the
+database is still empty (or being built) when the master preloads, so once the
+first index run bumps the generation each worker rebuilds its own filename map
+and category memo. Restarts over an existing database share them from the start.
+"""
+
+import gc
+import os
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # gunicorn is Unix-only; single-process mode still works
+    BaseApplication = None
+
+from workflow_db import available_cpus
+
+
+if BaseApplication is not None:
+
+    class PreloadedApplication(BaseApplication):
+        """Gunicorn application that warms the database before forking workers."""
+
+        def __init__(self, options: dict):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            import api_server
+
+            api_server.db.preload()
+            # Move everything loaded so far out of the collector's reach so that
+            # collections in the workers do not write to (and copy) shared pages
+            gc.freeze()
+            return api_server.app
+
+
+def run_workers(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int = 0,
+    log_level: str = "info",
+    access_log: bool = False,
+):
+    """Serve the API from a pre-forked pool of uvicorn workers (0 = one per CPU)."""
+    if BaseApplication is None:
+        raise RuntimeError(
+            "Multi-worker mode needs gunicorn: pip install gunicorn (Unix only)"
+        )
+    if workers <= 0:
+        workers = available_cpus()
+
+    # Workers only read the index, and share one rate limit across processes
+    os.environ["WORKFLOW_DB_READONLY"] = "1"
+    os.environ.setdefault("RATE_LIMIT_BACKEND", "sqlite")
+
+    print(f"🚀 Starting {workers} worker processes")
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "loglevel": log_level,
+        "accesslog": "-" if access_log else None,
+        "graceful_timeout": 30,
+        "keepalive": 5,
+    }
+    PreloadedApplication(options).run()
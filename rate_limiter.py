@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting
+Sliding-window-counter rate limiters for the API server.
+
+Each client key keeps only the request counts of the current and previous fixed
+window; the sliding estimate weights the previous count by how much of it still
+overlaps the trailing window. Every check is O(1) and state per key is constant.
+
+Backends:
+
+- memory: per-process, idle keys are evicted
+- sqlite: a small table shared by every worker process on the host
+
+Select with RATE_LIMIT_BACKEND=memory|sqlite (and RATE_LIMIT_DB_PATH and
+RATE_LIMIT_BUSY_TIMEOUT for sqlite).
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Tuple
+
+
+class SlidingWindowRateLimiter(ABC):
+    """Base class holding the sliding-window-counter arithmetic."""
+
+    def __init__(self, limit: int, window: float = 60.0):
+        self.limit = limit
+        self.window = window
+
+    def _window_position(self, now: float) -> Tuple[int, float]:
+        """Return the current window index and the fraction of it already elapsed."""
+        index = int(now // self.window)
+        return index, (now - index * self.window) / self.window
+
+    @staticmethod
+    def _roll(
+        window_index: int, current: int, previous: int, now_index: int
+    ) -> Tuple[int, int]:
+        """Shift stored counts forward to now_index; returns (current, previous)."""
+        if window_index == now_index:
+            return current, previous
+        if window_index == now_index - 1:
+            return 0, current
+        return 0, 0
+
+    def _admit(self, current: int, previous: int, elapsed: float) -> bool:
+        estimated = previous * (1.0 - elapsed) + current
+        return estimated < self.limit
+
+    @abstractmethod
+    def allow(self, key: str) -> bool:
+        """Record a request for key; returns False if it exceeds the limit."""
+
+
+class MemoryRateLimiter(SlidingWindowRateLimiter):
+    """In-process limiter; keys idle for a full window are evicted."""
+
+    def __init__(self, limit: int, window: float = 60.0, max_keys: int = 100_000):
+        super().__init__(limit, window)
+        self.max_keys = max_keys
+        # key -> (window_index, current, previous), least recently seen first
+        self._entries: "OrderedDict[str, Tuple[int, int, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        index, elapsed = self._window_position(time.time())
+        with self._lock:
+            entry = self._entries.get(key)
+            current, previous = self._roll(*entry, index) if entry else (0, 0)
+            allowed = self._admit(current, previous, elapsed)
+            if allowed:
+                current += 1
+            self._entries[key] = (index, current, previous)
+            self._entries.move_to_end(key)
+            self._evict(index)
+        return allowed
+
+    def _evict(self, index: int):
+        # Entries are ordered by last access, so idle keys sit at the front; a key
+        # last seen two windows ago no longer contributes to any estimate
+        while self._entries:
+            oldest_index = next(iter(self._entries.values()))[0]
+            if oldest_index >= index - 1 and len(self._entries) <= self.max_keys:
+                break
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteRateLimiter(SlidingWindowRateLimiter):
+    """Limiter backed by a SQLite table so every worker process shares the counts."""
+
+    # Purge idle keys after this many checks in a process
+    PURGE_INTERVAL = 1000
+
+    def __init__(
+        self,
+        db_path: str,
+        limit: int,
+        window: float = 60.0,
+        busy_timeout: float = 0.05,
+    ):
+        super().__init__(limit, window)
+        self.db_path = db_path
+        # allow() runs on the server's event loop: under lock contention it waits
+        # at most this long (seconds) and then fails open instead of stalling
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._checks = 0
+
+        # Set up on a throwaway connection: the limiter may be created in a
+        # pre-forking master, and SQLite connections must not cross fork()
+        conn = sqlite3.connect(self.db_path, timeout=5.0)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    key TEXT PRIMARY KEY,
+                    window_index INTEGER NOT NULL,
+                    current_count INTEGER NOT NULL,
+                    previous_count INTEGER NOT NULL
+                ) WITHOUT ROWID
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; allow() manages its own write transaction
+            conn = sqlite3.connect(
+                self.db_path, timeout=self.busy_timeout, isolation_level=None
+            )
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def allow(self, key: str) -> bool:
+        index, elapsed = self._window_position(time.time())
+        try:
+            conn = self._get_connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT window_index, current_count, previous_count "
+                    "FROM rate_limits WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                current, previous = self._roll(*row, index) if row else (0, 0)
+                allowed = self._admit(current, previous, elapsed)
+                if allowed:
+                    current += 1
+                conn.execute(
+                    """
+                    INSERT INTO rate_limits (key, window_index, current_count, previous_count)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET
+                        window_index = excluded.window_index,
+                        current_count = excluded.current_count,
+                        previous_count = excluded.previous_count
+                """,
+                    (key, index, current, previous),
+                )
+                self._checks += 1
+                if self._checks % self.PURGE_INTERVAL == 0:
+                    conn.execute(
+                        "DELETE FROM rate_limits WHERE window_index < ?", (index - 1,)
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            # Fail open: a locked or unavailable limiter must not take the API down
+            print(f"Warning: rate limiter unavailable: {str(e)}")
+            return True
+        return allowed
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def create_rate_limiter(limit: int, window: float = 60.0) -> SlidingWindowRateLimiter:
+    """Build the limiter selected by RATE_LIMIT_BACKEND (memory by default)."""
+    backend = os.environ.get("RATE_LIMIT_BACKEND", "memory").lower()
+    if backend == "memory":
+        return MemoryRateLimiter(limit, window)
+    if backend == "sqlite":
+        db_path = os.environ.get(
+            "RATE_LIMIT_DB_PATH",
+            os.path.join(tempfile.gettempdir(), "n8n_workflows_rate_limits.db"),
+        )
+        busy_timeout = float(os.environ.get("RATE_LIMIT_BUSY_TIMEOUT", "0.05"))
+        return SQLiteRateLimiter(db_path, limit, window, busy_timeout=busy_timeout)
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
@@ -8,6 +8,8 @@ import sys
 import os
 import argparse
 
+DB_PATH = "database/workflows.db"
+
 
 def print_banner():
     """Print application banner."""
@@ -53,40 +55,50 @@ def setup_directories():
     print("✅ Directories verified")
 
 
-def setup_database(force_reindex: bool = False, skip_index: bool = False) -> str:
-    """Setup and initialize the database."""
-    from workflow_db import WorkflowDatabase
+def setup_database(force_reindex: bool = False, skip_index: bool = False) -> bool:
+    """Create the database schema; returns True if the workflows need indexing.
 
-    db_path = "database/workflows.db"
+    Indexing itself runs in the background once the server is up (see
+    start_server), so startup does not wait for it.
+    """
+    from workflow_db import WorkflowDatabase
 
-    print(f"🔄 Setting up database: {db_path}")
-    db = WorkflowDatabase(db_path)
+    print(f"🔄 Setting up database: {DB_PATH}")
+    db = WorkflowDatabase(DB_PATH)
+    stats = db.get_stats()
+    last_indexed = db.get_index_state()[1]
+    db.close()
 
     # Skip indexing in CI mode or if explicitly requested
     if skip_index:
         print("⏭️  Skipping workflow indexing (CI mode)")
-        stats = db.get_stats()
         print(f"✅ Database ready: {stats['total']} workflows")
-        return db_path
-
-    # Check if database has data or force reindex
-    stats = db.get_stats()
-    if stats["total"] == 0 or force_reindex:
-        print("📚 Indexing workflows...")
-        index_stats = db.index_all_workflows(force_reindex=True)
-        print(f"✅ Indexed {index_stats['processed']} workflows")
-
-        # Show final stats
-        final_stats = db.get_stats()
-        print(f"📊 Database contains {final_stats['total']} workflows")
-    else:
-        print(f"✅ Database ready: {stats['total']} workflows")
-
-    return db_path
-
+        return False
 
-def start_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False):
-    """Start the FastAPI server."""
+    # Check if database has data or force reindex. A database indexed by an
+    # older version has no statistics snapshot; an incremental run adds it.
+    if stats["total"] == 0 or force_reindex or last_indexed is None:
+        print("📚 Workflows will be indexed in the background (progress: /ready)")
+        return True
+
+    print(f"✅ Database ready: {stats['total']} workflows")
+    return False
+
+
+def start_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    reload: bool = False,
+    workers: int = 1,
+    index: bool = False,
+    force_reindex: bool = False,
+    jobs: int = 1,
+):
+    """Start the FastAPI server (workers != 1 runs the multi-process production mode).
+
+    With index=True the workflows are indexed by a background process while the
+    server is already accepting connections.
+    """
     print(f"🌐 Starting server at http://{host}:{port}")
     print(f"📊 API Documentation: http://{host}:{port}/docs")
     print(f"🔍 Workflow Search: http://{host}:{port}/api/workflows")
@@ -95,7 +107,18 @@ def start_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False
     print("-" * 50)
 
     # Configure database path
-    os.environ["WORKFLOW_DB_PATH"] = "database/workflows.db"
+    os.environ["WORKFLOW_DB_PATH"] = DB_PATH
+
+    if index:
+        from background_index import start_background_indexing
+
+        start_background_indexing(DB_PATH, force_reindex=force_reindex, jobs=jobs)
+
+    if workers != 1 and not reload:
+        from production_server import run_workers
+
+        run_workers(host=host, port=port, workers=workers)
+        return
 
     # Start uvicorn with better configuration
     import uvicorn
@@ -122,7 +145,9 @@ Examples:
   python run.py --port 3000        # Start on port 3000
   python run.py --host 0.0.0.0     # Accept external connections
   python run.py --reindex          # Force database reindexing
+  python run.py --reindex --jobs 0 # Reindex using all CPU cores
   python run.py --dev              # Development mode with auto-reload
+  python run.py --workers 0        # Production: one worker process per CPU
         """,
     )
 
@@ -135,6 +160,18 @@ Examples:
     parser.add_argument(
         "--reindex", action="store_true", help="Force database reindexing"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for indexing (0 = all CPUs, default: 1)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("MAX_WORKERS", "1")),
+        help="Server worker processes (0 = all CPUs, default: $MAX_WORKERS or 1)",
+    )
     parser.add_argument(
         "--dev", action="store_true", help="Development mode with auto-reload"
     )
@@ -161,14 +198,22 @@ Examples:
 
     # Setup database
     try:
-        setup_database(force_reindex=args.reindex, skip_index=skip_index)
+        needs_index = setup_database(force_reindex=args.reindex, skip_index=skip_index)
     except Exception as e:
         print(f"❌ Database setup error: {e}")
         sys.exit(1)
 
     # Start server
     try:
-        start_server(host=args.host, port=args.port, reload=args.dev)
+        start_server(
+            host=args.host,
+            port=args.port,
+            reload=args.dev,
+            workers=args.workers,
+            index=needs_index,
+            force_reindex=args.reindex,
+            jobs=args.jobs,
+        )
     except KeyboardInterrupt:
         print("\n👋 Server stopped!")
     except Exception as e:
@@ -221,11 +221,11 @@ def save_search_index(search_index: Dict[str, Any], output_dir: str):
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
 
-    # Save complete index
+    # Save complete index (compact: it is fetched by every visitor of the site)
     with open(
         os.path.join(output_dir, "search-index.json"), "w", encoding="utf-8"
     ) as f:
-        json.dump(search_index, f, indent=2, ensure_ascii=False)
+        json.dump(search_index, f, separators=(",", ":"), ensure_ascii=False)
 
     # Save stats only (for quick loading)
     with open(os.path.join(output_dir, "stats.json"), "w", encoding="utf-8") as f:
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Precompress Static Assets
+Writes .br and .gz variants next to static files and generated JSON indexes so
+the server can pick one by Accept-Encoding instead of compressing per request.
+
+Brotli variants need the optional `brotli` package; without it only gzip is written.
+"""
+
+import argparse
+import gzip
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip variants are still written
+    brotli = None
+
+DEFAULT_PATHS = ["static", "docs/api"]
+COMPRESSIBLE_SUFFIXES = {".html", ".css", ".js", ".json", ".svg", ".txt", ".xml"}
+
+# A variant is only kept if it saves at least this fraction of the original size
+MIN_SAVINGS = 0.05
+
+
+def compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    """Return the available encoders keyed by variant suffix."""
+    available = {
+        # mtime=0 keeps the output reproducible across builds
+        ".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+    }
+    if brotli is not None:
+        available[".br"] = lambda data: brotli.compress(data, quality=11)
+    return available
+
+
+def iter_assets(paths: List[str]) -> List[Path]:
+    """Collect compressible files below the given files or directories."""
+    assets = []
+    for path in map(Path, paths):
+        candidates = [path] if path.is_file() else sorted(path.rglob("*"))
+        assets.extend(
+            p
+            for p in candidates
+            if p.is_file() and p.suffix.lower() in COMPRESSIBLE_SUFFIXES
+        )
+    return assets
+
+
+def precompress_file(
+    source: Path, encoders: Dict[str, Callable[[bytes], bytes]], force: bool = False
+) -> Dict[str, int]:
+    """Write the compressed variants of one file; returns the sizes written."""
+    source_stat = source.stat()
+    data = None
+    written = {}
+
+    for suffix, compress in encoders.items():
+        variant = source.with_name(source.name + suffix)
+        if (
+            not force
+            and variant.exists()
+            and variant.stat().st_mtime_ns >= source_stat.st_mtime_ns
+        ):
+            continue  # Up to date
+
+        if data is None:
+            data = source.read_bytes()
+        compressed = compress(data)
+
+        if len(compressed) > len(data) * (1 - MIN_SAVINGS):
+            # Not worth a variant; drop a stale one so it is never served
+            if variant.exists():
+                variant.unlink()
+            continue
+
+        tmp_path = variant.with_name(variant.name + ".tmp")
+        tmp_path.write_bytes(compressed)
+        os.replace(tmp_path, variant)
+        written[suffix] = len(compressed)
+
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write .br/.gz variants of static assets and JSON indexes"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=DEFAULT_PATHS,
+        help=f"Files or directories to process (default: {' '.join(DEFAULT_PATHS)})",
+    )
+    parser.add_argument(
+        "--min-size",
+        type=int,
+        default=1024,
+        help="Skip files smaller than this many bytes (default: 1024)",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Rewrite variants that are up to date"
+    )
+    args = parser.parse_args()
+
+    encoders = compressors()
+    if brotli is None:
+        print("brotli not installed: writing gzip variants only")
+
+    processed = 0
+    for source in iter_assets(args.paths):
+        size = source.stat().st_size
+        if size < args.min_size:
+            continue
+        written = precompress_file(source, encoders, force=args.force)
+        if written:
+            processed += 1
+            variants = ", ".join(
+                f"{suffix} {length:,} bytes" for suffix, length in written.items()
+            )
+            print(f"   {source} ({size:,} bytes): {variants}")
+
+    print(f"Precompressed {processed} file(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
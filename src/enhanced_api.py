@@ -5,6 +5,7 @@ Advanced features, analytics, and performance optimizations
 """
 
 import sqlite3
+import sys
 import time
 from datetime import datetime
 from typing import Dict, List, Optional
@@ -13,10 +14,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
 import uvicorn
+from pathlib import Path
 
 # Import community features
 from community_features import CommunityFeatures, create_community_api_endpoints
 
+# Add the parent directory to path for the shared workflow database
+sys.path.append(str(Path(__file__).parent.parent))
+
+from workflow_db import WorkflowDatabase
+
 
 class WorkflowSearchRequest(BaseModel):
     """Workflow search request model"""
@@ -53,6 +60,7 @@ class EnhancedAPI:
     def __init__(self, db_path: str = "workflows.db"):
         """Initialize enhanced API"""
         self.db_path = db_path
+        self.workflow_db = WorkflowDatabase(db_path)
         self.community = CommunityFeatures(db_path)
         self.app = FastAPI(
             title="N8N Workflows Enhanced API",
@@ -251,7 +259,9 @@ class EnhancedAPI:
             params.extend([search_term, search_term, search_term])
 
         if kwargs.get("category"):
-            conditions.append("w.category = ?")
+            conditions.append(
+                "w.filename IN (SELECT filename FROM workflow_categories WHERE category = ?)"
+            )
             params.append(kwargs["category"])
 
         if kwargs.get("trigger_type"):
@@ -263,8 +273,10 @@ class EnhancedAPI:
             params.append(kwargs["complexity"])
 
         if kwargs.get("integration"):
-            conditions.append("w.integrations LIKE ?")
-            params.append(f"%{kwargs['integration']}%")
+            conditions.append(
+                "w.id IN (SELECT workflow_id FROM workflow_integrations WHERE integration = ?)"
+            )
+            params.append(kwargs["integration"])
 
         if kwargs.get("min_rating"):
             conditions.append("ws.average_rating >= ?")
@@ -337,34 +349,32 @@ class EnhancedAPI:
         include_related: bool,
     ) -> Dict:
         """Get detailed workflow information"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Get basic workflow data
-        cursor.execute("SELECT * FROM workflows WHERE filename = ?", (workflow_id,))
-        workflow_row = cursor.fetchone()
-
-        if not workflow_row:
-            conn.close()
+        # Cached primary-key lookup; copy before adding per-request fields
+        workflow = self.workflow_db.get_workflow(workflow_id)
+        if not workflow:
             return None
 
         workflow_data = {
-            "filename": workflow_row[0],
-            "name": workflow_row[1],
-            "workflow_id": workflow_row[2],
-            "active": bool(workflow_row[3]),
-            "description": workflow_row[4],
-            "trigger_type": workflow_row[5],
-            "complexity": workflow_row[6],
-            "node_count": workflow_row[7],
-            "integrations": workflow_row[8],
-            "tags": workflow_row[9],
-            "created_at": workflow_row[10],
-            "updated_at": workflow_row[11],
-            "file_hash": workflow_row[12],
-            "file_size": workflow_row[13],
-            "analyzed_at": workflow_row[14],
+            key: workflow.get(key)
+            for key in (
+                "filename",
+                "name",
+                "workflow_id",
+                "active",
+                "description",
+                "trigger_type",
+                "complexity",
+                "node_count",
+                "integrations",
+                "tags",
+                "created_at",
+                "updated_at",
+                "file_hash",
+                "file_size",
+                "analyzed_at",
+            )
         }
+        workflow_data["active"] = bool(workflow_data["active"])
 
         # Add statistics if requested
         if include_stats:
@@ -381,7 +391,6 @@ class EnhancedAPI:
             related = self._get_related_workflows(workflow_id)
             workflow_data["related_workflows"] = related
 
-        conn.close()
         return workflow_data
 
     def _get_recommendations(
@@ -436,7 +445,12 @@ class EnhancedAPI:
         active_workflows = cursor.fetchone()[0]
 
         # Categories
-        cursor.execute("SELECT category, COUNT(*) FROM workflows GROUP BY category")
+        cursor.execute("""
+            SELECT COALESCE(wc.category, 'Uncategorized'), COUNT(*)
+            FROM workflows w
+            LEFT JOIN workflow_categories wc ON wc.filename = w.filename
+            GROUP BY 1
+        """)
         categories = dict(cursor.fetchall())
 
         # Integrations
@@ -500,29 +514,21 @@ class EnhancedAPI:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
-        # Get current workflow details
-        cursor.execute(
-            "SELECT integrations, category FROM workflows WHERE filename = ?",
-            (workflow_id,),
-        )
-        current_workflow = cursor.fetchone()
-
-        if not current_workflow:
-            conn.close()
-            return []
-
-        current_integrations = current_workflow[0] or ""
-        current_category = current_workflow[1] or ""
-
-        # Find related workflows
+        # Rank other workflows by how many integrations they share with this one
         cursor.execute(
             """
-            SELECT filename, name, description FROM workflows 
-            WHERE filename != ? 
-            AND (integrations LIKE ? OR category = ?)
+            SELECT w.filename, w.name, w.description, COUNT(*) AS shared
+            FROM workflow_integrations mine
+            JOIN workflow_integrations other
+                ON other.integration = mine.integration
+                AND other.workflow_id != mine.workflow_id
+            JOIN workflows w ON w.id = other.workflow_id
+            WHERE mine.workflow_id = (SELECT id FROM workflows WHERE filename = ?)
+            GROUP BY other.workflow_id
+            ORDER BY shared DESC, w.name
             LIMIT ?
         """,
-            (workflow_id, f"%{current_integrations[:50]}%", current_category, limit),
+            (workflow_id, limit),
         )
 
         related = []
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Precompressed Static Assets
+Serves the .br/.gz variants written by scripts/precompress_assets.py, chosen by
+the request's Accept-Encoding, so static files are never compressed per request.
+"""
+
+import mimetypes
+import os
+from typing import Optional, Set, Tuple
+
+from fastapi.responses import FileResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+# Server preference order: brotli is smaller, gzip is universally supported
+PRECOMPRESSED_VARIANTS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def accepted_encodings(accept_encoding: str) -> Set[str]:
+    """Parse an Accept-Encoding header into the set of codings with q > 0."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def find_precompressed(
+    full_path: str, stat_result: os.stat_result, accept_encoding: str
+) -> Optional[Tuple[str, str, os.stat_result]]:
+    """Return (variant path, encoding, stat) of the best acceptable fresh variant."""
+    accepted = accepted_encodings(accept_encoding)
+    for encoding, suffix in PRECOMPRESSED_VARIANTS:
+        if encoding not in accepted and "*" not in accepted:
+            continue
+        try:
+            variant_stat = os.stat(full_path + suffix)
+        except OSError:
+            continue
+        # A variant older than its source is stale; serve the source instead
+        if variant_stat.st_mtime_ns >= stat_result.st_mtime_ns:
+            return full_path + suffix, encoding, variant_stat
+    return None
+
+
+def _with_encoding(response: Response, full_path: str, encoding: str) -> Response:
+    media_type = mimetypes.guess_type(full_path)[0] or "text/plain"
+    if media_type.startswith("text/"):
+        media_type += "; charset=utf-8"
+    response.headers["content-type"] = media_type
+    response.headers["content-encoding"] = encoding
+    response.headers["vary"] = "Accept-Encoding"
+    return response
+
+
+def precompressed_file_response(full_path: str, accept_encoding: str) -> FileResponse:
+    """FileResponse for full_path, using a precompressed variant when acceptable."""
+    variant = find_precompressed(full_path, os.stat(full_path), accept_encoding)
+    if variant is None:
+        return FileResponse(full_path)
+    variant_path, encoding, variant_stat = variant
+    return _with_encoding(
+        FileResponse(variant_path, stat_result=variant_stat), full_path, encoding
+    )
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that prefers fresh .br/.gz siblings of the requested file."""
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope,
+        status_code: int = 200,
+    ) -> Response:
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        variant = find_precompressed(str(full_path), stat_result, accept_encoding)
+        if variant is None:
+            return super().file_response(full_path, stat_result, scope, status_code)
+        variant_path, encoding, variant_stat = variant
+        # The variant's own stat drives ETag/Last-Modified and 304 handling
+        response = super().file_response(variant_path, variant_stat, scope, status_code)
+        return _with_encoding(response, str(full_path), encoding)
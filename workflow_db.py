@@ -4,25 +4,342 @@ Fast N8N Workflow Database
 SQLite-based workflow indexer and search engine for instant performance.
 """
 
+import asyncio
+import base64
+import functools
 import sqlite3
 import json
 import os
 import datetime
 import hashlib
-from typing import Dict, List, Any, Optional, Tuple
+import math
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 from pathlib import Path
 
+from workflow_diagram import DETAIL_LEVELS, generate_mermaid_diagram
+
+# Triggers that keep the external-content FTS table in sync with workflows.
+# workflows_au only fires on the indexed columns so stat-only updates skip FTS work.
+FTS_TRIGGERS = {
+    "workflows_ai": """
+        CREATE TRIGGER IF NOT EXISTS workflows_ai AFTER INSERT ON workflows BEGIN
+            INSERT INTO workflows_fts(rowid, filename, name, description, integrations, tags)
+            VALUES (new.id, new.filename, new.name, new.description, new.integrations, new.tags);
+        END
+    """,
+    "workflows_ad": """
+        CREATE TRIGGER IF NOT EXISTS workflows_ad AFTER DELETE ON workflows BEGIN
+            INSERT INTO workflows_fts(workflows_fts, rowid, filename, name, description, integrations, tags)
+            VALUES ('delete', old.id, old.filename, old.name, old.description, old.integrations, old.tags);
+        END
+    """,
+    "workflows_au": """
+        CREATE TRIGGER IF NOT EXISTS workflows_au
+        AFTER UPDATE OF filename, name, description, integrations, tags ON workflows BEGIN
+            INSERT INTO workflows_fts(workflows_fts, rowid, filename, name, description, integrations, tags)
+            VALUES ('delete', old.id, old.filename, old.name, old.description, old.integrations, old.tags);
+            INSERT INTO workflows_fts(rowid, filename, name, description, integrations, tags)
+            VALUES (new.id, new.filename, new.name, new.description, new.integrations, new.tags);
+        END
+    """,
+}
+
+# Upsert keeps the row id stable and fires the UPDATE trigger, unlike INSERT OR
+# REPLACE whose implicit delete bypasses workflows_ad and leaves stale FTS rows.
+UPSERT_WORKFLOW_SQL = """
+    INSERT INTO workflows (
+        filename, name, workflow_id, active, description, trigger_type,
+        complexity, node_count, integrations, tags, created_at, updated_at,
+        file_hash, file_size, file_mtime_ns, file_inode, relative_path, summary_json,
+        analyzed_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(filename) DO UPDATE SET
+        name = excluded.name,
+        workflow_id = excluded.workflow_id,
+        active = excluded.active,
+        description = excluded.description,
+        trigger_type = excluded.trigger_type,
+        complexity = excluded.complexity,
+        node_count = excluded.node_count,
+        integrations = excluded.integrations,
+        tags = excluded.tags,
+        created_at = excluded.created_at,
+        updated_at = excluded.updated_at,
+        file_hash = excluded.file_hash,
+        file_size = excluded.file_size,
+        file_mtime_ns = excluded.file_mtime_ns,
+        file_inode = excluded.file_inode,
+        relative_path = excluded.relative_path,
+        summary_json = excluded.summary_json,
+        analyzed_at = excluded.analyzed_at
+"""
+
+# Applied once to every pooled read connection
+READ_CONNECTION_PRAGMAS = (
+    "PRAGMA cache_size=-16000",  # 16 MB page cache per connection
+    "PRAGMA mmap_size=268435456",  # Map up to 256 MB of the database file
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA query_only=ON",
+)
+
+
+def normalize_tags(raw_tags: Any) -> List[str]:
+    """Flatten n8n tags (strings or {"id", "name"} objects) to a list of names."""
+    clean_tags = []
+    for tag in raw_tags or []:
+        if isinstance(tag, dict):
+            # Extract name from tag dict if available
+            clean_tags.append(tag.get("name", str(tag.get("id", "tag"))))
+        else:
+            clean_tags.append(str(tag))
+    return clean_tags
+
+
+def _optional_str(value: Any) -> Optional[str]:
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+def workflow_summary_json(workflow: Dict[str, Any]) -> str:
+    """Render the API's WorkflowSummary object for a workflow, without its id.
+
+    The indexer stores this in workflows.summary_json; listing queries splice the
+    row id in front (see SUMMARY_COLUMNS) so responses need no per-row decoding.
+    """
+    summary = {
+        "filename": workflow["filename"],
+        "name": _optional_str(workflow.get("name")) or "",
+        "active": bool(workflow.get("active")),
+        "description": _optional_str(workflow.get("description")) or "",
+        "trigger_type": _optional_str(workflow.get("trigger_type")) or "Manual",
+        "complexity": _optional_str(workflow.get("complexity")) or "low",
+        "node_count": int(workflow.get("node_count") or 0),
+        "integrations": [str(i) for i in workflow.get("integrations") or []],
+        "tags": normalize_tags(workflow.get("tags")),
+        "created_at": _optional_str(workflow.get("created_at")),
+        "updated_at": _optional_str(workflow.get("updated_at")),
+    }
+    return json.dumps(summary, ensure_ascii=False, separators=(",", ":"))
+
+
+# Public workflow metadata. Bookkeeping columns added for the indexer
+# (file_mtime_ns, file_inode, relative_path, summary_json) stay internal.
+WORKFLOW_COLUMNS = (
+    "id",
+    "filename",
+    "name",
+    "workflow_id",
+    "active",
+    "description",
+    "trigger_type",
+    "complexity",
+    "node_count",
+    "integrations",
+    "tags",
+    "created_at",
+    "updated_at",
+    "file_hash",
+    "file_size",
+    "analyzed_at",
+)
+METADATA_COLUMNS = ", ".join(f"w.{column}" for column in WORKFLOW_COLUMNS)
+
+# Listing projection: the stored summary with the row id spliced in as its first
+# key, plus the columns keyset pagination needs
+SUMMARY_COLUMNS = (
+    "w.id, w.analyzed_at, "
+    "'{\"id\":' || w.id || ',' || substr(w.summary_json, 2) AS summary"
+)
+
+
+def available_cpus() -> int:
+    """CPUs this process may use, honouring CPU affinity and cgroup v2 quotas."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        # Container CPU limit, e.g. "50000 100000" for half a core
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+class QueryCache:
+    """Thread-safe LRU cache with a TTL whose entries are tied to an index generation.
+
+    An entry stored under an older generation is treated as a miss, so bumping the
+    generation invalidates everything without having to enumerate keys. Cached
+    values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Any, Tuple[int, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, generation: int) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry_generation, expires_at, value = entry
+            if entry_generation != generation or expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Any, generation: int, value: Any):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (generation, time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def after_fork(self):
+        """Replace the lock in a forked child; the entries stay shared copy-on-write."""
+        self._lock = threading.Lock()
+
+
+# Databases whose runtime state is reset in forked children (see _reset_after_fork)
+_OPEN_DATABASES: "weakref.WeakSet[WorkflowDatabase]" = weakref.WeakSet()
+
+
+def _reset_after_fork():
+    for database in list(_OPEN_DATABASES):
+        database._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
 
 class WorkflowDatabase:
     """High-performance SQLite database for workflow metadata and search."""
 
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, read_only: Optional[bool] = None):
         # Use environment variable if no path provided
         if db_path is None:
             db_path = os.environ.get("WORKFLOW_DB_PATH", "workflows.db")
+        if read_only is None:
+            read_only = os.environ.get("WORKFLOW_DB_READONLY", "").lower() in (
+                "1",
+                "true",
+                "yes",
+            )
         self.db_path = db_path
+        self.read_only = read_only
         self.workflows_dir = "workflows"
-        self.init_database()
+        self.context_dir = os.environ.get("WORKFLOW_CONTEXT_DIR", "context")
+        self._init_runtime_state()
+        # Read-only instances (server workers) expect an already indexed database
+        if not read_only:
+            self.init_database()
+        _OPEN_DATABASES.add(self)
+
+    # Per-process state that is rebuilt instead of pickled
+    _RUNTIME_ATTRS = (
+        "_local",
+        "_pool_lock",
+        "_pooled_connections",
+        "_query_cache",
+        "_path_lock",
+        "_path_map",
+        "_path_map_generation",
+        "_missing_paths",
+        "_workflow_cache",
+        "_workflow_cache_lock",
+    )
+
+    def _init_runtime_state(self):
+        """Set up the per-thread connection pool and the in-memory caches."""
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._pooled_connections: List[sqlite3.Connection] = []
+        self._query_cache = QueryCache(
+            max_entries=int(os.environ.get("WORKFLOW_QUERY_CACHE_SIZE", "512")),
+            ttl=float(os.environ.get("WORKFLOW_QUERY_CACHE_TTL", "300")),
+        )
+        self._path_lock = threading.Lock()
+        self._path_map: Dict[str, str] = {}
+        self._path_map_generation: Optional[int] = None
+        self._missing_paths: "OrderedDict[str, bool]" = OrderedDict()
+        self._workflow_cache: "OrderedDict[str, Tuple[int, Dict]]" = OrderedDict()
+        self._workflow_cache_lock = threading.Lock()
+
+    def __getstate__(self):
+        # Connections and locks cannot cross process boundaries (e.g. the indexing pool)
+        state = self.__dict__.copy()
+        for key in self._RUNTIME_ATTRS:
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_runtime_state()
+
+    def _after_fork(self):
+        """Give a forked child its own connections and locks.
+
+        SQLite connections must not be used across fork(), so inherited handles are
+        dropped unused (preload() closes them before forking anyway). The caches and
+        the path map are kept: the child shares those pages with its parent.
+        """
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._pooled_connections = []
+        self._path_lock = threading.Lock()
+        self._workflow_cache_lock = threading.Lock()
+        self._query_cache.after_fork()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return this thread's pooled read-only connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.read_only:
+                # mode=ro: the process can never write, whatever the code path
+                database = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            else:
+                database = self.db_path
+            # Only the owning thread uses the connection; close() may run elsewhere
+            conn = sqlite3.connect(
+                database,
+                check_same_thread=False,
+                cached_statements=256,
+                uri=self.read_only,
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in READ_CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._pool_lock:
+                self._pooled_connections.append(conn)
+        return conn
+
+    def close(self):
+        """Close all pooled read connections."""
+        with self._pool_lock:
+            connections = self._pooled_connections
+            self._pooled_connections = []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
 
     def init_database(self):
         """Initialize SQLite database with optimized schema and indexes."""
@@ -50,9 +367,24 @@ class WorkflowDatabase:
                 updated_at TEXT,
                 file_hash TEXT,
                 file_size INTEGER,
+                file_mtime_ns INTEGER,
+                file_inode INTEGER,
+                relative_path TEXT,  -- Path below the workflows directory
+                summary_json TEXT,   -- Pre-rendered API summary (without id)
                 analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        self._add_missing_columns(
+            conn,
+            "workflows",
+            (
+                ("file_mtime_ns", "INTEGER"),
+                ("file_inode", "INTEGER"),
+                ("relative_path", "TEXT"),
+                ("summary_json", "TEXT"),
+            ),
+        )
+        self._backfill_summary_json(conn)
 
         # Create FTS5 table for full-text search
         conn.execute("""
@@ -79,41 +411,391 @@ class WorkflowDatabase:
             "CREATE INDEX IF NOT EXISTS idx_node_count ON workflows(node_count)"
         )
         conn.execute("CREATE INDEX IF NOT EXISTS idx_filename ON workflows(filename)")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analyzed_at ON workflows(analyzed_at)"
+        )
 
-        # Create triggers to keep FTS table in sync
+        # Normalized workflow -> integration pairs for indexed integration filters.
+        # NOCASE so exact-name lookups are case-insensitive and still use the index.
         conn.execute("""
-            CREATE TRIGGER IF NOT EXISTS workflows_ai AFTER INSERT ON workflows BEGIN
-                INSERT INTO workflows_fts(rowid, filename, name, description, integrations, tags)
-                VALUES (new.id, new.filename, new.name, new.description, new.integrations, new.tags);
-            END
+            CREATE TABLE IF NOT EXISTS workflow_integrations (
+                workflow_id INTEGER NOT NULL,
+                integration TEXT NOT NULL COLLATE NOCASE,
+                PRIMARY KEY (workflow_id, integration)
+            ) WITHOUT ROWID
         """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_integration_workflow "
+            "ON workflow_integrations(integration, workflow_id)"
+        )
+        self._backfill_workflow_integrations(conn)
 
+        # Mermaid diagrams precomputed at index time, keyed by file content hash
+        # and detail level. The table is a pure cache, so a layout without the
+        # detail column is dropped and refilled by the next index run.
+        diagram_columns = {
+            row[1] for row in conn.execute("PRAGMA table_info(workflow_diagrams)")
+        }
+        if diagram_columns and "detail" not in diagram_columns:
+            conn.execute("DROP TABLE workflow_diagrams")
         conn.execute("""
-            CREATE TRIGGER IF NOT EXISTS workflows_ad AFTER DELETE ON workflows BEGIN
-                INSERT INTO workflows_fts(workflows_fts, rowid, filename, name, description, integrations, tags)
-                VALUES ('delete', old.id, old.filename, old.name, old.description, old.integrations, old.tags);
-            END
+            CREATE TABLE IF NOT EXISTS workflow_diagrams (
+                file_hash TEXT NOT NULL,
+                detail TEXT NOT NULL,
+                diagram TEXT NOT NULL,
+                PRIMARY KEY (file_hash, detail)
+            ) WITHOUT ROWID
         """)
 
+        # Single-row statistics snapshot maintained by index_all_workflows
         conn.execute("""
-            CREATE TRIGGER IF NOT EXISTS workflows_au AFTER UPDATE ON workflows BEGIN
-                INSERT INTO workflows_fts(workflows_fts, rowid, filename, name, description, integrations, tags)
-                VALUES ('delete', old.id, old.filename, old.name, old.description, old.integrations, old.tags);
-                INSERT INTO workflows_fts(rowid, filename, name, description, integrations, tags)
-                VALUES (new.id, new.filename, new.name, new.description, new.integrations, new.tags);
-            END
+            CREATE TABLE IF NOT EXISTS workflow_stats_summary (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total INTEGER NOT NULL,
+                active INTEGER NOT NULL,
+                total_nodes INTEGER NOT NULL,
+                unique_integrations INTEGER NOT NULL,
+                triggers TEXT NOT NULL,    -- JSON object
+                complexity TEXT NOT NULL,  -- JSON object
+                last_indexed TEXT,
+                generation INTEGER NOT NULL DEFAULT 0,  -- Bumped whenever workflows change
+                modified_at TEXT  -- When the generation was last bumped
+            )
+        """)
+        self._add_missing_columns(
+            conn,
+            "workflow_stats_summary",
+            (("generation", "INTEGER NOT NULL DEFAULT 0"), ("modified_at", "TEXT")),
+        )
+
+        # Category data imported from the context/ JSON files
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_categories (
+                filename TEXT PRIMARY KEY,
+                category TEXT NOT NULL
+            ) WITHOUT ROWID
         """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_workflow_categories_category "
+            "ON workflow_categories(category, filename)"
+        )
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS integration_categories (
+                integration TEXT PRIMARY KEY COLLATE NOCASE,
+                category TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS category_sources (
+                name TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+
+        # Create triggers to keep FTS table in sync
+        self._create_fts_triggers(conn)
+
+        if self._load_categories(conn):
+            self._bump_generation(conn)
 
         conn.commit()
         conn.close()
 
+    def _create_fts_triggers(self, conn: sqlite3.Connection):
+        """Create the FTS sync triggers, replacing outdated definitions."""
+        for name, sql in FTS_TRIGGERS.items():
+            row = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?",
+                (name,),
+            ).fetchone()
+            if row and name == "workflows_au" and "UPDATE OF" not in row[0]:
+                conn.execute(f"DROP TRIGGER {name}")
+            conn.execute(sql)
+
+    def _drop_fts_triggers(self, conn: sqlite3.Connection):
+        """Drop the FTS sync triggers (the FTS table must be rebuilt afterwards)."""
+        for name in FTS_TRIGGERS:
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    def relative_workflow_path(self, file_path: str) -> str:
+        """Return a workflow file's path below the workflows directory (POSIX style)."""
+        return Path(os.path.relpath(file_path, self.workflows_dir)).as_posix()
+
+    def resolve_workflow_path(self, filename: str) -> Optional[Path]:
+        """Find a workflow file by filename using the indexed path map.
+
+        The map is loaded from the relative_path column once per index generation,
+        so a hit costs one stat. Names missing from the index fall back to probing
+        each workflows subdirectory; misses are remembered in a bounded negative cache
+        until the generation changes.
+        """
+        generation = self.get_index_generation()
+        with self._path_lock:
+            self._load_path_map(generation)
+            relative_path = self._path_map.get(filename)
+            if relative_path is None and filename in self._missing_paths:
+                return None
+
+        if relative_path is not None:
+            candidate = Path(self.workflows_dir) / relative_path
+            if candidate.is_file():
+                # rglob indexes symlinks too: never serve one leading outside
+                try:
+                    candidate.resolve().relative_to(
+                        Path(self.workflows_dir).resolve()
+                    )
+                    return candidate
+                except ValueError:
+                    print(
+                        f"Security: Blocked access to file outside workflows: {candidate}"
+                    )
+                    return None
+
+        # Not indexed yet, or moved since the last index run
+        found = self._scan_for_workflow(filename)
+        with self._path_lock:
+            if found is not None:
+                self._path_map[filename] = self.relative_workflow_path(str(found))
+                self._missing_paths.pop(filename, None)
+            else:
+                self._missing_paths[filename] = True
+                while len(self._missing_paths) > 4096:
+                    self._missing_paths.popitem(last=False)
+        return found
+
+    def _load_path_map(self, generation: int):
+        """Reload the filename to relative path map if the index changed (hold _path_lock)."""
+        if self._path_map_generation == generation:
+            return
+        rows = self._get_connection().execute(
+            "SELECT filename, relative_path FROM workflows WHERE relative_path IS NOT NULL"
+        )
+        self._path_map = {row["filename"]: row["relative_path"] for row in rows}
+        self._path_map_generation = generation
+        self._missing_paths.clear()
+
+    def preload(self):
+        """Load the per-generation read state up front, then close the connections.
+
+        Called in a pre-forking server's master process: the filename map and the
+        category data are built once and shared with every worker copy-on-write, and
+        no SQLite connection is open when the workers fork.
+        """
+        with self._path_lock:
+            self._load_path_map(self.get_index_generation())
+        self.get_categories()
+        self.get_category_mappings()
+        self.close()
+
+    def _scan_for_workflow(self, filename: str) -> Optional[Path]:
+        """Probe every workflows subdirectory for filename (slow path)."""
+        workflows_path = Path(self.workflows_dir).resolve()
+        if not workflows_path.is_dir():
+            return None
+        for subdir in workflows_path.iterdir():
+            if subdir.is_dir():
+                target_file = subdir / filename
+                if target_file.is_file():
+                    # Verify the file is actually within workflows directory
+                    try:
+                        target_file.resolve().relative_to(workflows_path)
+                        return target_file
+                    except ValueError:
+                        print(
+                            f"Security: Blocked access to file outside workflows: {target_file}"
+                        )
+        return None
+
+    def _add_missing_columns(
+        self,
+        conn: sqlite3.Connection,
+        table: str,
+        columns: Tuple[Tuple[str, str], ...],
+    ):
+        """Add columns introduced after the original schema to existing databases."""
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column, column_type in columns:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+    def read_workflow_file(self, file_path: str) -> Tuple[bytearray, os.stat_result]:
+        """Read a workflow file into memory with a single sized read.
+
+        The stat is taken from the open descriptor before reading, so size, mtime,
+        inode, hash and parsed JSON all describe the same buffer.
+        """
+        with open(file_path, "rb", buffering=0) as f:
+            file_stat = os.fstat(f.fileno())
+            buffer = bytearray(file_stat.st_size)
+            view = memoryview(buffer)
+            read = 0
+            while read < file_stat.st_size:
+                n = f.readinto(view[read:])
+                if not n:
+                    break
+                read += n
+            if read < file_stat.st_size:
+                # File was truncated while reading
+                del buffer[read:]
+            else:
+                # File grew while reading; pick up the remainder
+                buffer += f.read()
+        return buffer, file_stat
+
+    def hash_content(self, content: bytes) -> str:
+        """Hash file contents for change detection (BLAKE2b, 128-bit hex digest)."""
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    def _backfill_workflow_integrations(self, conn: sqlite3.Connection):
+        """Populate workflow_integrations for databases indexed before it existed."""
+        if conn.execute("SELECT 1 FROM workflow_integrations LIMIT 1").fetchone():
+            return
+        conn.execute("""
+            INSERT OR IGNORE INTO workflow_integrations (workflow_id, integration)
+            SELECT w.id, j.value FROM workflows w, json_each(w.integrations) j
+        """)
+
+    def _backfill_summary_json(self, conn: sqlite3.Connection):
+        """Render summary_json for rows indexed before the column existed."""
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        rows = cursor.execute(
+            "SELECT * FROM workflows WHERE summary_json IS NULL"
+        ).fetchall()
+        conn.executemany(
+            "UPDATE workflows SET summary_json = ? WHERE id = ?",
+            [
+                (workflow_summary_json(self._row_to_workflow(row)), row["id"])
+                for row in rows
+            ],
+        )
+
+    def _load_categories(self, conn: sqlite3.Connection) -> bool:
+        """Import the context/ category files whose mtime or size changed.
+
+        Returns True if any table was reloaded; the caller bumps the generation.
+        A file that cannot be read or parsed keeps the previously imported
+        categories, but its signature is still recorded so that it is retried
+        when it changes again rather than on every check.
+        """
+        importers = {
+            "search_categories.json": self._import_workflow_categories,
+            "def_categories.json": self._import_integration_categories,
+        }
+        changed = False
+        for name, importer in importers.items():
+            path = os.path.join(self.context_dir, name)
+            signature = self._category_file_signature(name)
+            row = conn.execute(
+                "SELECT mtime_ns, size FROM category_sources WHERE name = ?", (name,)
+            ).fetchone()
+            if (tuple(row) if row else None) == signature:
+                continue
+
+            try:
+                if signature is None:
+                    items = []
+                else:
+                    with open(path, "r", encoding="utf-8") as f:
+                        items = json.load(f)
+                    if not isinstance(items, list):
+                        raise ValueError("expected a JSON list")
+            except (OSError, ValueError) as e:
+                print(f"Warning: could not load categories from {path}: {str(e)}")
+                items = None
+
+            if items is not None:
+                importer(conn, [item for item in items if isinstance(item, dict)])
+                changed = True
+            if signature is None:
+                conn.execute("DELETE FROM category_sources WHERE name = ?", (name,))
+            else:
+                conn.execute(
+                    "INSERT OR REPLACE INTO category_sources (name, mtime_ns, size) "
+                    "VALUES (?, ?, ?)",
+                    (name, *signature),
+                )
+        return changed
+
+    def _category_file_signature(self, name: str) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of a context/ category file, or None if missing."""
+        try:
+            file_stat = os.stat(os.path.join(self.context_dir, name))
+        except OSError:
+            return None
+        return file_stat.st_mtime_ns, file_stat.st_size
+
+    def categories_changed(self) -> bool:
+        """Return True if a category file differs from its imported version.
+
+        Only stats the files, so servers can poll it; reloading them needs a
+        writable instance (refresh_categories) or an indexing run.
+        """
+        stored = {
+            row["name"]: (row["mtime_ns"], row["size"])
+            for row in self._get_connection().execute(
+                "SELECT name, mtime_ns, size FROM category_sources"
+            )
+        }
+        return any(
+            self._category_file_signature(name) != stored.get(name)
+            for name in ("search_categories.json", "def_categories.json")
+        )
+
+    def _import_workflow_categories(self, conn: sqlite3.Connection, items: List[Dict]):
+        conn.execute("DELETE FROM workflow_categories")
+        conn.executemany(
+            "INSERT OR REPLACE INTO workflow_categories (filename, category) VALUES (?, ?)",
+            [
+                (item["filename"], item.get("category") or "Uncategorized")
+                for item in items
+                if item.get("filename")
+            ],
+        )
+
+    def _import_integration_categories(
+        self, conn: sqlite3.Connection, items: List[Dict]
+    ):
+        conn.execute("DELETE FROM integration_categories")
+        conn.executemany(
+            "INSERT OR REPLACE INTO integration_categories (integration, category) "
+            "VALUES (?, ?)",
+            [
+                (item["integration"], item["category"])
+                for item in items
+                if item.get("integration") and item.get("category")
+            ],
+        )
+
+    def _bump_generation(self, conn: sqlite3.Connection):
+        """Invalidate generation-keyed caches without recomputing statistics."""
+        conn.execute(
+            "UPDATE workflow_stats_summary SET generation = generation + 1, "
+            "modified_at = ? WHERE id = 1",
+            (datetime.datetime.now().isoformat(),),
+        )
+
+    def refresh_categories(self) -> bool:
+        """Reload the category files if they changed on disk; returns True if reloaded."""
+        if self.read_only:
+            return False
+        conn = sqlite3.connect(self.db_path)
+        try:
+            changed = self._load_categories(conn)
+            if changed:
+                self._bump_generation(conn)
+            conn.commit()
+        finally:
+            conn.close()
+        if changed:
+            self._query_cache.clear()
+        return changed
+
     def get_file_hash(self, file_path: str) -> str:
-        """Get MD5 hash of file for change detection."""
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+        """Get content hash of file for change detection."""
+        buffer, _ = self.read_workflow_file(file_path)
+        return self.hash_content(buffer)
 
     def format_workflow_name(self, filename: str) -> str:
         """Convert filename to readable workflow name."""
@@ -155,16 +837,16 @@ class WorkflowDatabase:
 
     def analyze_workflow_file(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Analyze a single workflow file and extract metadata."""
+        # Size, hash and parsed JSON are all derived from one read of the file
+        buffer, file_stat = self.read_workflow_file(file_path)
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = json.loads(buffer)
         except (json.JSONDecodeError, UnicodeDecodeError) as e:
             print(f"Error reading {file_path}: {str(e)}")
             return None
 
         filename = os.path.basename(file_path)
-        file_size = os.path.getsize(file_path)
-        file_hash = self.get_file_hash(file_path)
+        file_hash = self.hash_content(buffer)
 
         # Extract basic metadata
         workflow = {
@@ -178,7 +860,10 @@ class WorkflowDatabase:
             "created_at": data.get("createdAt", ""),
             "updated_at": data.get("updatedAt", ""),
             "file_hash": file_hash,
-            "file_size": file_size,
+            "file_size": file_stat.st_size,
+            "file_mtime_ns": file_stat.st_mtime_ns,
+            "file_inode": file_stat.st_ino,
+            "relative_path": self.relative_workflow_path(file_path),
         }
 
         # Use JSON name if available and meaningful, otherwise use formatted filename
@@ -218,6 +903,18 @@ class WorkflowDatabase:
                 workflow, trigger_type, integrations
             )
 
+        # Precompute every detail level; the API generates them lazily if this fails
+        try:
+            workflow["diagrams"] = {
+                detail: generate_mermaid_diagram(
+                    workflow["nodes"], workflow["connections"], detail
+                )
+                for detail in DETAIL_LEVELS
+            }
+        except Exception as e:
+            print(f"Error generating diagram for {file_path}: {str(e)}")
+            workflow["diagrams"] = {}
+
         return workflow
 
     def analyze_nodes(self, nodes: List[Dict]) -> Tuple[str, set]:
@@ -452,8 +1149,123 @@ class WorkflowDatabase:
 
         return desc + "."
 
-    def index_all_workflows(self, force_reindex: bool = False) -> Dict[str, int]:
-        """Index all workflow files. Only reprocesses changed files unless force_reindex=True."""
+    def _analyze_files(
+        self, file_paths: List[str], jobs: int = 1
+    ) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Analyze workflow files, spreading the work across a process pool when jobs > 1.
+
+        Yields (file_path, workflow_data) pairs in input order; workflow_data is None
+        for files that could not be analyzed.
+        """
+        if jobs <= 1 or len(file_paths) < 2:
+            for file_path in file_paths:
+                try:
+                    yield file_path, self.analyze_workflow_file(file_path)
+                except Exception as e:
+                    print(f"Error processing {file_path}: {str(e)}")
+                    yield file_path, None
+            return
+
+        # Large chunks keep the per-task IPC overhead small relative to the parsing work
+        chunksize = max(1, min(64, len(file_paths) // (jobs * 4)))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = executor.map(
+                _analyze_workflow_file_safe,
+                [self] * len(file_paths),
+                file_paths,
+                chunksize=chunksize,
+            )
+            yield from zip(file_paths, results)
+
+    def _workflow_row(self, workflow_data: Dict[str, Any]) -> Tuple:
+        """Build the UPSERT_WORKFLOW_SQL parameters for an analyzed workflow."""
+        return (
+            workflow_data["filename"],
+            workflow_data["name"],
+            workflow_data["workflow_id"],
+            workflow_data["active"],
+            workflow_data["description"],
+            workflow_data["trigger_type"],
+            workflow_data["complexity"],
+            workflow_data["node_count"],
+            json.dumps(workflow_data["integrations"]),
+            json.dumps(workflow_data["tags"]),
+            workflow_data["created_at"],
+            workflow_data["updated_at"],
+            workflow_data["file_hash"],
+            workflow_data["file_size"],
+            workflow_data["file_mtime_ns"],
+            workflow_data["file_inode"],
+            workflow_data["relative_path"],
+            workflow_summary_json(workflow_data),
+        )
+
+    def _write_workflows(
+        self, conn: sqlite3.Connection, workflows: List[Dict[str, Any]]
+    ) -> List[str]:
+        """Write a batch of analyzed workflows with executemany; returns the filenames written.
+
+        If the batch is rejected it is retried row by row so one bad workflow
+        only costs itself. The integration pairs and diagrams of every written
+        workflow are refreshed afterwards.
+        """
+        rows = [self._workflow_row(workflow_data) for workflow_data in workflows]
+        try:
+            conn.executemany(UPSERT_WORKFLOW_SQL, rows)
+            written = workflows
+        except sqlite3.Error:
+            written = []
+            for workflow_data, row in zip(workflows, rows):
+                try:
+                    conn.execute(UPSERT_WORKFLOW_SQL, row)
+                    written.append(workflow_data)
+                except sqlite3.Error as e:
+                    print(f"Error processing {row[0]}: {str(e)}")
+
+        filenames = [(workflow_data["filename"],) for workflow_data in written]
+        conn.executemany(
+            """
+            DELETE FROM workflow_integrations
+            WHERE workflow_id = (SELECT id FROM workflows WHERE filename = ?)
+        """,
+            filenames,
+        )
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO workflow_integrations (workflow_id, integration)
+            SELECT w.id, j.value FROM workflows w, json_each(w.integrations) j
+            WHERE w.filename = ?
+        """,
+            filenames,
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO workflow_diagrams (file_hash, detail, diagram) "
+            "VALUES (?, ?, ?)",
+            [
+                (workflow_data["file_hash"], detail, diagram)
+                for workflow_data in written
+                for detail, diagram in workflow_data.get("diagrams", {}).items()
+            ],
+        )
+        return [filename for (filename,) in filenames]
+
+    def index_all_workflows(
+        self,
+        force_reindex: bool = False,
+        jobs: int = 1,
+        batch_size: int = 500,
+        rebuild_fts: bool = True,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, int]:
+        """Index all workflow files. Only reprocesses changed files unless force_reindex=True.
+
+        With jobs > 1 the file analysis runs in a pool of worker processes while this
+        process remains the single writer (jobs=0 uses every available CPU). Rows are
+        written with executemany and committed every batch_size workflows. On a forced
+        reindex with rebuild_fts the FTS triggers are dropped and workflows_fts is
+        rebuilt once at the end, all inside a single transaction. progress, if given,
+        is called with (files done, files to analyze) after each batch.
+        """
         if not os.path.exists(self.workflows_dir):
             print(f"Warning: Workflows directory '{self.workflows_dir}' not found.")
             return {"processed": 0, "skipped": 0, "errors": 0}
@@ -465,6 +1277,9 @@ class WorkflowDatabase:
             print(f"Warning: No JSON files found in '{self.workflows_dir}' directory.")
             return {"processed": 0, "skipped": 0, "errors": 0}
 
+        if jobs <= 0:
+            jobs = available_cpus()
+
         print(f"Indexing {len(json_files)} workflow files...")
 
         conn = sqlite3.connect(self.db_path)
@@ -472,70 +1287,284 @@ class WorkflowDatabase:
 
         stats = {"processed": 0, "skipped": 0, "errors": 0}
 
+        # Load the stored fingerprints of every indexed file in one query
+        known_files = {}
+        if not force_reindex:
+            cursor = conn.execute(
+                """
+                SELECT filename, file_hash, file_size, file_mtime_ns, file_inode, relative_path
+                FROM workflows
+            """
+            )
+            known_files = {row["filename"]: row for row in cursor}
+
+        # Check which files need to be reprocessed. Files whose size, mtime and inode
+        # are unchanged are skipped without reading them; the rest are hashed first.
+        pending_files = []
+        stat_updates = []
+        path_updates = []
         for file_path in json_files:
             filename = os.path.basename(file_path)
 
             try:
-                # Check if file needs to be reprocessed
-                if not force_reindex:
-                    current_hash = self.get_file_hash(file_path)
-                    cursor = conn.execute(
-                        "SELECT file_hash FROM workflows WHERE filename = ?",
-                        (filename,),
-                    )
-                    row = cursor.fetchone()
-                    if row and row["file_hash"] == current_hash:
+                known = known_files.get(filename)
+                if known is not None:
+                    relative_path = self.relative_workflow_path(file_path)
+                    if known["relative_path"] != relative_path:
+                        # Moved between directories (or indexed before paths were stored)
+                        path_updates.append((relative_path, filename))
+
+                    file_stat = os.stat(file_path)
+                    if (
+                        known["file_size"] == file_stat.st_size
+                        and known["file_mtime_ns"] == file_stat.st_mtime_ns
+                        and known["file_inode"] == file_stat.st_ino
+                    ):
                         stats["skipped"] += 1
                         continue
 
-                # Analyze workflow
-                workflow_data = self.analyze_workflow_file(file_path)
-                if not workflow_data:
-                    stats["errors"] += 1
-                    continue
+                    buffer, _ = self.read_workflow_file(file_path)
+                    file_hash = self.hash_content(buffer)
+                    if known["file_hash"] == file_hash or (
+                        # Rows indexed before stats were stored carry an MD5 hash
+                        known["file_mtime_ns"] is None
+                        and known["file_hash"] == hashlib.md5(buffer).hexdigest()
+                    ):
+                        # Touched but not modified: refresh the stored fingerprint only
+                        stat_updates.append(
+                            (
+                                file_hash,
+                                file_stat.st_size,
+                                file_stat.st_mtime_ns,
+                                file_stat.st_ino,
+                                filename,
+                            )
+                        )
+                        stats["skipped"] += 1
+                        continue
+                pending_files.append(file_path)
+            except Exception as e:
+                print(f"Error processing {file_path}: {str(e)}")
+                stats["errors"] += 1
 
-                # Insert or update in database
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO workflows (
-                        filename, name, workflow_id, active, description, trigger_type,
-                        complexity, node_count, integrations, tags, created_at, updated_at,
-                        file_hash, file_size, analyzed_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """,
-                    (
-                        workflow_data["filename"],
-                        workflow_data["name"],
-                        workflow_data["workflow_id"],
-                        workflow_data["active"],
-                        workflow_data["description"],
-                        workflow_data["trigger_type"],
-                        workflow_data["complexity"],
-                        workflow_data["node_count"],
-                        json.dumps(workflow_data["integrations"]),
-                        json.dumps(workflow_data["tags"]),
-                        workflow_data["created_at"],
-                        workflow_data["updated_at"],
-                        workflow_data["file_hash"],
-                        workflow_data["file_size"],
-                    ),
-                )
+        if stat_updates:
+            conn.executemany(
+                "UPDATE workflows SET file_hash = ?, file_size = ?, file_mtime_ns = ?, "
+                "file_inode = ? WHERE filename = ?",
+                stat_updates,
+            )
+        if path_updates:
+            conn.executemany(
+                "UPDATE workflows SET relative_path = ? WHERE filename = ?",
+                path_updates,
+            )
 
-                stats["processed"] += 1
+        if jobs > 1 and len(pending_files) > 1:
+            print(f"Analyzing {len(pending_files)} files with {jobs} worker processes...")
 
-            except Exception as e:
-                print(f"Error processing {file_path}: {str(e)}")
+        if progress is not None:
+            progress(0, len(pending_files))
+
+        bulk_rebuild = force_reindex and rebuild_fts
+        if bulk_rebuild:
+            # DDL does not open a transaction implicitly; begin one so the dropped
+            # triggers, the writes and the rebuild commit (or roll back) together
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            self._drop_fts_triggers(conn)
+
+        pending_workflows = []
+        for done, (file_path, workflow_data) in enumerate(
+            self._analyze_files(pending_files, jobs), 1
+        ):
+            if not workflow_data:
                 stats["errors"] += 1
                 continue
 
+            pending_workflows.append(workflow_data)
+            if len(pending_workflows) >= batch_size:
+                written = len(self._write_workflows(conn, pending_workflows))
+                stats["processed"] += written
+                stats["errors"] += len(pending_workflows) - written
+                pending_workflows = []
+                if not bulk_rebuild:
+                    conn.commit()
+                if progress is not None:
+                    progress(done, len(pending_files))
+
+        if pending_workflows:
+            written = len(self._write_workflows(conn, pending_workflows))
+            stats["processed"] += written
+            stats["errors"] += len(pending_workflows) - written
+        if progress is not None and pending_files:
+            progress(len(pending_files), len(pending_files))
+
+        if bulk_rebuild:
+            conn.execute("INSERT INTO workflows_fts(workflows_fts) VALUES ('rebuild')")
+            self._create_fts_triggers(conn)
+
+        if stats["processed"]:
+            # Drop diagrams of content that no workflow has any more
+            conn.execute(
+                "DELETE FROM workflow_diagrams WHERE file_hash NOT IN (SELECT file_hash FROM workflows)"
+            )
+
+        categories_changed = self._load_categories(conn)
+
+        self._refresh_stats_summary(
+            conn,
+            recompute=stats["processed"] > 0
+            or bool(path_updates)
+            or categories_changed,
+        )
+
         conn.commit()
         conn.close()
+        self._query_cache.clear()
 
         print(
             f"✅ Indexing complete: {stats['processed']} processed, {stats['skipped']} skipped, {stats['errors']} errors"
         )
         return stats
 
+    def _encode_cursor(self, sort_column: str, sort_value: Any, row_id: int) -> str:
+        """Encode a keyset position as an opaque, URL-safe cursor string."""
+        payload = json.dumps([sort_column, sort_value, row_id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def _decode_cursor(self, cursor: str, sort_column: str) -> Tuple[Any, int]:
+        """Decode a cursor produced by _encode_cursor; raises ValueError if invalid."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            column, sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        except Exception:
+            raise ValueError("Invalid pagination cursor")
+        if column != sort_column or type(row_id) is not int:
+            raise ValueError("Pagination cursor does not match this query")
+        # bm25() ranks are numbers; the other sort columns are timestamps stored
+        # as text. A mistyped value would compare against every row and yield
+        # an empty or wrong page instead of an error.
+        value_types = (int, float) if sort_column == "rank" else (str,)
+        if sort_value is not None and (
+            isinstance(sort_value, bool) or not isinstance(sort_value, value_types)
+        ):
+            raise ValueError("Pagination cursor does not match this query")
+        return sort_value, row_id
+
+    def _fetch_page(
+        self,
+        conn: sqlite3.Connection,
+        base_query: str,
+        params: List[Any],
+        sort_column: str,
+        descending: bool,
+        limit: int,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[sqlite3.Row], Optional[int], Optional[str]]:
+        """Run a paginated query ordered by (sort_column, w.id).
+
+        With a cursor the page starts right after the encoded (sort value, id)
+        position instead of skipping offset rows, so deep pages cost the same as
+        the first one. Returns (rows, total or None, next cursor or None).
+        """
+        total = None
+        if include_total:
+            count_query = f"SELECT COUNT(*) as total FROM ({base_query}) t"
+            total = conn.execute(count_query, params).fetchone()["total"]
+
+        page_query = base_query
+        page_params = list(params)
+        direction = "DESC" if descending else "ASC"
+        if cursor:
+            sort_value, row_id = self._decode_cursor(cursor, sort_column)
+            page_query += f" AND ({sort_column}, w.id) {'<' if descending else '>'} (?, ?)"
+            page_params += [sort_value, row_id]
+            offset = 0
+
+        # Fetch one extra row to learn whether another page follows. Bound
+        # LIMIT/OFFSET keep the statement text stable for the statement cache.
+        page_query += f" ORDER BY {sort_column} {direction}, w.id {direction} LIMIT ? OFFSET ?"
+        rows = conn.execute(page_query, page_params + [limit + 1, offset]).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = self._encode_cursor(
+                sort_column, last[sort_column.split(".")[-1]], last["id"]
+            )
+        return rows, total, next_cursor
+
+    def _row_to_workflow(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a workflows row to a dictionary with parsed JSON fields."""
+        workflow = dict(row)
+        workflow["integrations"] = json.loads(workflow["integrations"] or "[]")
+
+        # Parse tags and convert dict tags to strings
+        workflow["tags"] = normalize_tags(json.loads(workflow["tags"] or "[]"))
+        return workflow
+
+    def _page_results(self, rows: List[sqlite3.Row], summaries: bool) -> List[Any]:
+        """Turn page rows into summary JSON strings or workflow dictionaries."""
+        if summaries:
+            return [row["summary"] for row in rows]
+        return [self._row_to_workflow(row) for row in rows]
+
+    def get_workflow(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Get one workflow's metadata by filename (primary-key style lookup).
+
+        Results are kept in a small LRU keyed by index generation; any index or
+        category change (a forced reindex, a new analyzer) refetches the row, since
+        an unchanged file_hash does not mean unchanged metadata. The returned
+        dictionary is shared and must not be mutated.
+        """
+        generation = self.get_index_generation()
+        with self._workflow_cache_lock:
+            entry = self._workflow_cache.get(filename)
+            if entry is not None and entry[0] == generation:
+                self._workflow_cache.move_to_end(filename)
+                return entry[1]
+
+        row = self._get_connection().execute(
+            f"SELECT {METADATA_COLUMNS} FROM workflows w WHERE filename = ?",
+            (filename,),
+        ).fetchone()
+        if row is None:
+            with self._workflow_cache_lock:
+                self._workflow_cache.pop(filename, None)
+            return None
+        workflow = self._row_to_workflow(row)
+
+        with self._workflow_cache_lock:
+            self._workflow_cache[filename] = (generation, workflow)
+            self._workflow_cache.move_to_end(filename)
+            while len(self._workflow_cache) > 1024:
+                self._workflow_cache.popitem(last=False)
+        return workflow
+
+    def get_workflows(self, filenames: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get metadata for many workflows at once, keyed by filename.
+
+        Runs one IN (...) query per chunk of names (bounded by SQLite's variable
+        limit); filenames that are not indexed are simply absent from the result.
+        """
+        conn = self._get_connection()
+        unique = list(dict.fromkeys(filenames))
+        workflows = {}
+        for start in range(0, len(unique), 500):
+            chunk = unique[start : start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"SELECT {METADATA_COLUMNS} FROM workflows w "
+                f"WHERE filename IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            for row in rows:
+                workflows[row["filename"]] = self._row_to_workflow(row)
+        return workflows
+
     def search_workflows(
         self,
         query: str = "",
@@ -546,8 +1575,59 @@ class WorkflowDatabase:
         offset: int = 0,
     ) -> Tuple[List[Dict], int]:
         """Fast search with filters and pagination."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        results, total, _ = self.search_workflows_page(
+            query=query,
+            trigger_filter=trigger_filter,
+            complexity_filter=complexity_filter,
+            active_only=active_only,
+            limit=limit,
+            offset=offset,
+        )
+        return results, total
+
+    def search_workflows_page(
+        self,
+        query: str = "",
+        trigger_filter: str = "all",
+        complexity_filter: str = "all",
+        active_only: bool = False,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        summaries: bool = False,
+        category_filter: str = "all",
+        use_cache: bool = True,
+    ) -> Tuple[List[Any], Optional[int], Optional[str]]:
+        """Search with filters and offset or keyset (cursor) pagination.
+
+        Results are ordered by (rank, id) for text queries and by
+        (analyzed_at DESC, id DESC) otherwise. Returns (workflows, total, next_cursor);
+        total is None when include_total is False. With summaries=True the workflows
+        are the pre-rendered WorkflowSummary JSON strings instead of dictionaries.
+        Results are served from the query cache until the index generation changes;
+        bulk walks over many pages pass use_cache=False to leave it alone.
+        """
+        query = " ".join(query.split())
+        cache_key = (
+            "search",
+            query,
+            trigger_filter,
+            complexity_filter,
+            active_only,
+            limit,
+            offset,
+            cursor,
+            include_total,
+            summaries,
+            category_filter,
+        )
+        generation = self.get_index_generation()
+        cached = self._query_cache.get(cache_key, generation) if use_cache else None
+        if cached is not None:
+            return cached
+
+        conn = self._get_connection()
 
         # Build WHERE clause
         where_conditions = []
@@ -564,70 +1644,62 @@ class WorkflowDatabase:
             where_conditions.append("w.complexity = ?")
             params.append(complexity_filter)
 
+        if category_filter == "Uncategorized":
+            # Workflows missing from the category file count as uncategorized
+            where_conditions.append(
+                "w.filename NOT IN (SELECT filename FROM workflow_categories "
+                "WHERE category != 'Uncategorized')"
+            )
+        elif category_filter != "all":
+            where_conditions.append(
+                "w.filename IN (SELECT filename FROM workflow_categories WHERE category = ?)"
+            )
+            params.append(category_filter)
+
+        columns = SUMMARY_COLUMNS if summaries else METADATA_COLUMNS
+
         # Use FTS search if query provided
-        if query.strip():
+        if query:
             # FTS search with ranking
-            base_query = """
-                SELECT w.*, rank
+            base_query = f"""
+                SELECT {columns}, rank
                 FROM workflows_fts fts
                 JOIN workflows w ON w.id = fts.rowid
                 WHERE workflows_fts MATCH ?
             """
             params.insert(0, query)
+            sort_column, descending = "rank", False
         else:
             # Regular query without FTS
-            base_query = """
-                SELECT w.*, 0 as rank
+            base_query = f"""
+                SELECT {columns}, 0 as rank
                 FROM workflows w
                 WHERE 1=1
             """
+            sort_column, descending = "w.analyzed_at", True
 
         if where_conditions:
             base_query += " AND " + " AND ".join(where_conditions)
 
-        # Count total results
-        count_query = f"SELECT COUNT(*) as total FROM ({base_query}) t"
-        cursor = conn.execute(count_query, params)
-        total = cursor.fetchone()["total"]
-
-        # Get paginated results
-        if query.strip():
-            base_query += " ORDER BY rank"
-        else:
-            base_query += " ORDER BY w.analyzed_at DESC"
-
-        base_query += f" LIMIT {limit} OFFSET {offset}"
-
-        cursor = conn.execute(base_query, params)
-        rows = cursor.fetchall()
-
-        # Convert to dictionaries and parse JSON fields
-        results = []
-        for row in rows:
-            workflow = dict(row)
-            workflow["integrations"] = json.loads(workflow["integrations"] or "[]")
-
-            # Parse tags and convert dict tags to strings
-            raw_tags = json.loads(workflow["tags"] or "[]")
-            clean_tags = []
-            for tag in raw_tags:
-                if isinstance(tag, dict):
-                    # Extract name from tag dict if available
-                    clean_tags.append(tag.get("name", str(tag.get("id", "tag"))))
-                else:
-                    clean_tags.append(str(tag))
-            workflow["tags"] = clean_tags
-
-            results.append(workflow)
-
-        conn.close()
-        return results, total
+        rows, total, next_cursor = self._fetch_page(
+            conn,
+            base_query,
+            params,
+            sort_column,
+            descending,
+            limit,
+            offset=offset,
+            cursor=cursor,
+            include_total=include_total,
+        )
 
-    def get_stats(self) -> Dict[str, Any]:
-        """Get database statistics."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        result = self._page_results(rows, summaries), total, next_cursor
+        if use_cache:
+            self._query_cache.put(cache_key, generation, result)
+        return result
 
+    def _compute_stats(self, conn: sqlite3.Connection) -> Dict[str, Any]:
+        """Aggregate workflow statistics directly from the workflows table."""
         # Basic counts
         cursor = conn.execute("SELECT COUNT(*) as total FROM workflows")
         total = cursor.fetchone()["total"]
@@ -659,14 +1731,9 @@ class WorkflowDatabase:
 
         # Unique integrations count
         cursor = conn.execute(
-            "SELECT integrations FROM workflows WHERE integrations != '[]'"
+            "SELECT COUNT(DISTINCT integration) as unique_integrations FROM workflow_integrations"
         )
-        all_integrations = set()
-        for row in cursor.fetchall():
-            integrations = json.loads(row["integrations"])
-            all_integrations.update(integrations)
-
-        conn.close()
+        unique_integrations = cursor.fetchone()["unique_integrations"]
 
         return {
             "total": total,
@@ -675,8 +1742,135 @@ class WorkflowDatabase:
             "triggers": triggers,
             "complexity": complexity,
             "total_nodes": total_nodes,
-            "unique_integrations": len(all_integrations),
-            "last_indexed": datetime.datetime.now().isoformat(),
+            "unique_integrations": unique_integrations,
+        }
+
+    def _refresh_stats_summary(self, conn: sqlite3.Connection, recompute: bool):
+        """Update the materialized statistics row after an indexing run.
+
+        Aggregates are only recomputed, and the index generation bumped, when
+        workflows changed (or no snapshot exists yet); last_indexed is stamped on
+        every run.
+        """
+        last_indexed = datetime.datetime.now().isoformat()
+        if not recompute:
+            cursor = conn.execute(
+                "UPDATE workflow_stats_summary SET last_indexed = ? WHERE id = 1",
+                (last_indexed,),
+            )
+            if cursor.rowcount:
+                return
+
+        stats = self._compute_stats(conn)
+        conn.execute(
+            """
+            INSERT INTO workflow_stats_summary (
+                id, total, active, total_nodes, unique_integrations,
+                triggers, complexity, last_indexed, generation, modified_at
+            ) VALUES (1, ?, ?, ?, ?, ?, ?, ?, 1, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                total = excluded.total,
+                active = excluded.active,
+                total_nodes = excluded.total_nodes,
+                unique_integrations = excluded.unique_integrations,
+                triggers = excluded.triggers,
+                complexity = excluded.complexity,
+                last_indexed = excluded.last_indexed,
+                generation = generation + 1,
+                modified_at = excluded.modified_at
+        """,
+            (
+                stats["total"],
+                stats["active"],
+                stats["total_nodes"],
+                stats["unique_integrations"],
+                json.dumps(stats["triggers"]),
+                json.dumps(stats["complexity"]),
+                last_indexed,
+                last_indexed,
+            ),
+        )
+
+    def get_diagram(self, file_hash: str, detail: str = "full") -> Optional[str]:
+        """Return the precomputed Mermaid diagram for a file hash and detail level, if any."""
+        row = self._get_connection().execute(
+            "SELECT diagram FROM workflow_diagrams WHERE file_hash = ? AND detail = ?",
+            (file_hash, detail),
+        ).fetchone()
+        return row["diagram"] if row else None
+
+    def store_diagram(self, file_hash: str, diagram: str, detail: str = "full"):
+        """Cache a lazily generated diagram (best effort; read-only databases skip it)."""
+        if self.read_only:
+            return
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO workflow_diagrams (file_hash, detail, diagram) "
+                    "VALUES (?, ?, ?)",
+                    (file_hash, detail, diagram),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Warning: could not cache diagram {file_hash}: {str(e)}")
+
+    def get_index_generation(self) -> int:
+        """Return the index generation, bumped by every indexing run that changed data."""
+        row = self._get_connection().execute(
+            "SELECT generation FROM workflow_stats_summary WHERE id = 1"
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_index_state(self) -> Tuple[int, Optional[str], Optional[str]]:
+        """Return (generation, last_indexed, modified_at) in one lookup.
+
+        modified_at is when the generation last changed (an index run that changed
+        workflows, or a category reload); no-op reindexes only move last_indexed.
+        Snapshots written before it was tracked fall back to last_indexed.
+        """
+        row = self._get_connection().execute(
+            "SELECT generation, last_indexed, COALESCE(modified_at, last_indexed) "
+            "FROM workflow_stats_summary WHERE id = 1"
+        ).fetchone()
+        return (row[0], row[1], row[2]) if row else (0, None, None)
+
+    def has_workflows(self) -> bool:
+        """Return True if at least one workflow is indexed."""
+        return (
+            self._get_connection()
+            .execute("SELECT EXISTS (SELECT 1 FROM workflows)")
+            .fetchone()[0]
+            == 1
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get database statistics from the snapshot maintained at index time."""
+        conn = self._get_connection()
+
+        row = conn.execute(
+            "SELECT * FROM workflow_stats_summary WHERE id = 1"
+        ).fetchone()
+        if row is None:
+            # Database was never indexed with this version: aggregate on the fly
+            stats = self._compute_stats(conn)
+            last_indexed = conn.execute(
+                "SELECT MAX(analyzed_at) FROM workflows"
+            ).fetchone()[0]
+            stats["last_indexed"] = last_indexed or ""
+            return stats
+
+        return {
+            "total": row["total"],
+            "active": row["active"],
+            "inactive": row["total"] - row["active"],
+            "triggers": json.loads(row["triggers"]),
+            "complexity": json.loads(row["complexity"]),
+            "total_nodes": row["total_nodes"],
+            "unique_integrations": row["unique_integrations"],
+            "last_indexed": row["last_indexed"] or "",
         }
 
     def get_service_categories(self) -> Dict[str, List[str]]:
@@ -736,60 +1930,188 @@ class WorkflowDatabase:
             ],
         }
 
+    def get_categories(self) -> List[str]:
+        """Sorted workflow categories, memoized until the index generation changes."""
+        generation = self.get_index_generation()
+        cached = self._query_cache.get(("categories",), generation)
+        if cached is not None:
+            return cached
+        rows = self._get_connection().execute(
+            "SELECT DISTINCT category FROM workflow_categories ORDER BY category"
+        ).fetchall()
+        categories = [row["category"] for row in rows] or ["Uncategorized"]
+        self._query_cache.put(("categories",), generation, categories)
+        return categories
+
+    def get_category_mappings(self) -> Dict[str, str]:
+        """Filename to category mapping, memoized until the index generation changes.
+
+        The returned dictionary is shared and must not be mutated.
+        """
+        generation = self.get_index_generation()
+        cached = self._query_cache.get(("category_mappings",), generation)
+        if cached is not None:
+            return cached
+        rows = self._get_connection().execute(
+            "SELECT filename, category FROM workflow_categories ORDER BY filename"
+        ).fetchall()
+        mappings = {row["filename"]: row["category"] for row in rows}
+        self._query_cache.put(("category_mappings",), generation, mappings)
+        return mappings
+
     def search_by_category(
         self, category: str, limit: int = 50, offset: int = 0
     ) -> Tuple[List[Dict], int]:
         """Search workflows by service category."""
+        results, total, _ = self.search_by_category_page(
+            category, limit=limit, offset=offset
+        )
+        return results, total
+
+    def search_by_category_page(
+        self,
+        category: str,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        summaries: bool = False,
+    ) -> Tuple[List[Any], Optional[int], Optional[str]]:
+        """Search workflows by category with offset or keyset pagination.
+
+        category is one of the built-in service categories or a category from
+        def_categories.json (matched through integration_categories). summaries
+        works as in search_workflows_page.
+        """
         categories = self.get_service_categories()
-        if category not in categories:
-            return [], 0
 
-        services = categories[category]
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        cache_key = (
+            "category",
+            category,
+            limit,
+            offset,
+            cursor,
+            include_total,
+            summaries,
+        )
+        generation = self.get_index_generation()
+        cached = self._query_cache.get(cache_key, generation)
+        if cached is not None:
+            return cached
+
+        conn = self._get_connection()
+        columns = SUMMARY_COLUMNS if summaries else METADATA_COLUMNS
+        if category in categories:
+            # Match any service in the category through the integration index
+            services = list(categories[category])
+            integrations = f"integration IN ({', '.join('?' for _ in services)})"
+            params = services
+        else:
+            # Integration names in def_categories.json differ from ours in case
+            integrations = (
+                "integration COLLATE NOCASE IN "
+                "(SELECT integration FROM integration_categories WHERE category = ?)"
+            )
+            params = [category]
+        base_query = f"""
+            SELECT {columns} FROM workflows w
+            WHERE w.id IN (
+                SELECT workflow_id FROM workflow_integrations WHERE {integrations}
+            )
+        """
 
-        # Build OR conditions for all services in category
-        service_conditions = []
-        params = []
-        for service in services:
-            service_conditions.append("integrations LIKE ?")
-            params.append(f'%"{service}"%')
+        rows, total, next_cursor = self._fetch_page(
+            conn,
+            base_query,
+            params,
+            "w.analyzed_at",
+            True,
+            limit,
+            offset=offset,
+            cursor=cursor,
+            include_total=include_total,
+        )
 
-        where_clause = " OR ".join(service_conditions)
+        result = self._page_results(rows, summaries), total, next_cursor
+        self._query_cache.put(cache_key, generation, result)
+        return result
 
-        # Count total results
-        count_query = f"SELECT COUNT(*) as total FROM workflows WHERE {where_clause}"
-        cursor = conn.execute(count_query, params)
-        total = cursor.fetchone()["total"]
 
-        # Get paginated results
-        query = f"""
-            SELECT * FROM workflows 
-            WHERE {where_clause}
-            ORDER BY analyzed_at DESC
-            LIMIT {limit} OFFSET {offset}
-        """
+class AsyncWorkflowDatabase:
+    """Asyncio facade that runs WorkflowDatabase calls on a dedicated reader thread pool.
 
-        cursor = conn.execute(query, params)
-        rows = cursor.fetchall()
-
-        # Convert to dictionaries and parse JSON fields
-        results = []
-        for row in rows:
-            workflow = dict(row)
-            workflow["integrations"] = json.loads(workflow["integrations"] or "[]")
-            raw_tags = json.loads(workflow["tags"] or "[]")
-            clean_tags = []
-            for tag in raw_tags:
-                if isinstance(tag, dict):
-                    clean_tags.append(tag.get("name", str(tag.get("id", "tag"))))
-                else:
-                    clean_tags.append(str(tag))
-            workflow["tags"] = clean_tags
-            results.append(workflow)
+    Each reader thread gets its own pooled SQLite connection, and SQLite releases the
+    GIL while a query runs, so concurrent requests overlap instead of blocking the
+    event loop one after another.
+    """
 
-        conn.close()
-        return results, total
+    def __init__(self, db: WorkflowDatabase, max_workers: Optional[int] = None):
+        if max_workers is None:
+            max_workers = int(os.environ.get("WORKFLOW_DB_READERS", "4"))
+        self.db = db
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="workflow-db-reader"
+        )
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking callable on the reader pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def search_workflows(self, *args, **kwargs) -> Tuple[List[Dict], int]:
+        return await self.run(self.db.search_workflows, *args, **kwargs)
+
+    async def search_workflows_page(
+        self, *args, **kwargs
+    ) -> Tuple[List[Any], Optional[int], Optional[str]]:
+        return await self.run(self.db.search_workflows_page, *args, **kwargs)
+
+    async def search_by_category(self, *args, **kwargs) -> Tuple[List[Dict], int]:
+        return await self.run(self.db.search_by_category, *args, **kwargs)
+
+    async def search_by_category_page(
+        self, *args, **kwargs
+    ) -> Tuple[List[Any], Optional[int], Optional[str]]:
+        return await self.run(self.db.search_by_category_page, *args, **kwargs)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        return await self.run(self.db.get_stats)
+
+    async def get_workflow(self, filename: str) -> Optional[Dict[str, Any]]:
+        return await self.run(self.db.get_workflow, filename)
+
+    async def get_workflows(self, filenames: List[str]) -> Dict[str, Dict[str, Any]]:
+        return await self.run(self.db.get_workflows, filenames)
+
+    async def get_categories(self) -> List[str]:
+        return await self.run(self.db.get_categories)
+
+    async def get_category_mappings(self) -> Dict[str, str]:
+        return await self.run(self.db.get_category_mappings)
+
+    def shutdown(self):
+        """Stop the reader threads and close their connections."""
+        self._executor.shutdown(wait=True)
+        self.db.close()
+
+
+def _analyze_workflow_file_safe(
+    db: WorkflowDatabase, file_path: str
+) -> Optional[Dict[str, Any]]:
+    """Process-pool entry point: analyze one file without letting errors escape the worker."""
+    try:
+        workflow = db.analyze_workflow_file(file_path)
+    except Exception as e:
+        print(f"Error processing {file_path}: {str(e)}")
+        return None
+    if workflow is not None:
+        # The writer never reads the raw graph (diagrams are rendered here), and
+        # it is most of the pickled payload sent back to the parent
+        workflow.pop("nodes", None)
+        workflow.pop("connections", None)
+    return workflow
 
 
 def main():
@@ -799,6 +2121,12 @@ def main():
     parser = argparse.ArgumentParser(description="N8N Workflow Database")
     parser.add_argument("--index", action="store_true", help="Index all workflows")
     parser.add_argument("--force", action="store_true", help="Force reindex all files")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for indexing (0 = all CPUs, default: 1)",
+    )
     parser.add_argument("--search", help="Search workflows")
     parser.add_argument("--stats", action="store_true", help="Show database statistics")
 
@@ -807,7 +2135,7 @@ def main():
     db = WorkflowDatabase()
 
     if args.index:
-        stats = db.index_all_workflows(force_reindex=args.force)
+        stats = db.index_all_workflows(force_reindex=args.force, jobs=args.jobs)
         print(f"Indexed {stats['processed']} workflows")
 
     elif args.search:
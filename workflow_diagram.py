@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Workflow Diagram Generation
+Mermaid.js flowcharts for n8n workflows, shared by the API server and the indexer.
+
+Diagrams come in three levels of detail so very large workflows stay renderable:
+
+- full: every node and connection
+- compact: annotations dropped, noOp nodes bypassed and long linear chains collapsed
+- overview: compact plus large fan-outs grouped, under a hard node budget
+
+A level whose result exceeds its node budget falls back to the next coarser one,
+so the output size is bounded regardless of workflow size.
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+DETAIL_LEVELS = ("full", "compact", "overview")
+
+# Maximum rendered nodes per level before falling back to the next coarser level
+NODE_BUDGETS = {"full": 150, "compact": 80, "overview": 30}
+
+# Nodes that carry no data flow: dropped outright
+ANNOTATION_NODE_TYPES = {"n8n-nodes-base.stickyNote"}
+
+# Nodes that pass data through unchanged: bypassed, predecessors linked to successors
+PASSTHROUGH_NODE_TYPES = {"n8n-nodes-base.noOp"}
+
+# Linear runs at least this long collapse into one node (compact and overview)
+MIN_CHAIN_LENGTH = 3
+
+# Leaf successors beyond this count are grouped into one node (overview)
+MAX_FANOUT = 4
+
+# Shared styles, emitted once per diagram instead of one style line per node
+CLASS_STYLES = {
+    "trigger": "fill:#b3e0ff,stroke:#0066cc",  # Blue for triggers
+    "condition": "fill:#ffffb3,stroke:#e6e600",  # Yellow for conditional nodes
+    "code": "fill:#d9b3ff,stroke:#6600cc",  # Purple for code nodes
+    "error": "fill:#ffb3b3,stroke:#cc0000",  # Red for error handlers
+    "default": "fill:#d9d9d9,stroke:#666666",  # Gray for other nodes
+    "cluster": "fill:#f2f2f2,stroke:#999999,stroke-dasharray:4 2",  # Collapsed groups
+}
+
+
+class _Graph:
+    """Ordered node/edge container used while simplifying a workflow."""
+
+    def __init__(self):
+        self.labels: Dict[str, str] = {}
+        self.classes: Dict[str, str] = {}
+        self.edges: Dict[Tuple[str, str], Optional[str]] = {}
+        self._clusters = 0
+
+    def add_node(self, node_id: str, label: str, node_class: str):
+        self.labels[node_id] = label
+        self.classes[node_id] = node_class
+
+    def add_cluster(self, label: str) -> str:
+        node_id = f"cluster{self._clusters}"
+        self._clusters += 1
+        self.add_node(node_id, label, "cluster")
+        return node_id
+
+    def add_edge(self, source: str, target: str, label: Optional[str] = None):
+        if source != target and (source, target) not in self.edges:
+            self.edges[(source, target)] = label
+
+    def remove_node(self, node_id: str):
+        del self.labels[node_id]
+        del self.classes[node_id]
+        self.edges = {
+            edge: label for edge, label in self.edges.items() if node_id not in edge
+        }
+
+    def successors(self, node_id: str) -> List[str]:
+        return [target for (source, target) in self.edges if source == node_id]
+
+    def predecessors(self, node_id: str) -> List[str]:
+        return [source for (source, target) in self.edges if target == node_id]
+
+    def replace_nodes(self, node_ids: List[str], replacement: str):
+        """Merge node_ids into replacement, rerouting their external edges."""
+        merged = set(node_ids)
+        edges = {}
+        for (source, target), label in self.edges.items():
+            source = replacement if source in merged else source
+            target = replacement if target in merged else target
+            if source != target and (source, target) not in edges:
+                edges[(source, target)] = label
+        self.edges = edges
+        for node_id in node_ids:
+            del self.labels[node_id]
+            del self.classes[node_id]
+
+
+def _node_class(node_type: str) -> str:
+    """Pick the shared style class for a node type."""
+    node_type = node_type.lower()
+    if any(x in node_type for x in ["trigger", "webhook", "cron"]):
+        return "trigger"
+    elif any(x in node_type for x in ["if", "switch"]):
+        return "condition"
+    elif any(x in node_type for x in ["function", "code"]):
+        return "code"
+    elif "error" in node_type:
+        return "error"
+    return "default"
+
+
+def _build_graph(
+    nodes: List[Dict], connections: Dict, drop_annotations: bool
+) -> Tuple[_Graph, List[str]]:
+    """Build the diagram graph; returns it with the ids of passthrough nodes."""
+    graph = _Graph()
+    mermaid_ids = {}
+    passthrough = []
+
+    for i, node in enumerate(nodes):
+        if not isinstance(node, dict):
+            continue
+        raw_type = node.get("type", "")
+        if drop_annotations and raw_type in ANNOTATION_NODE_TYPES:
+            continue
+
+        node_name = node.get("name", f"Node {i}")
+        if node_name in mermaid_ids:
+            continue
+        node_id = f"node{i}"
+        mermaid_ids[node_name] = node_id
+
+        node_type = raw_type.replace("n8n-nodes-base.", "")
+        # Add node with label (escaping special characters)
+        clean_name = str(node_name).replace('"', "'")
+        clean_type = node_type.replace('"', "'")
+        graph.add_node(node_id, f"{clean_name}<br>({clean_type})", _node_class(node_type))
+        if raw_type in PASSTHROUGH_NODE_TYPES:
+            passthrough.append(node_id)
+
+    # Add connections between nodes
+    for source_name, source_connections in connections.items():
+        if source_name not in mermaid_ids:
+            continue
+
+        if isinstance(source_connections, dict) and "main" in source_connections:
+            main_connections = source_connections["main"]
+            if not isinstance(main_connections, list):
+                continue
+
+            for i, output_connections in enumerate(main_connections):
+                if not isinstance(output_connections, list):
+                    continue
+
+                for connection in output_connections:
+                    if not isinstance(connection, dict) or "node" not in connection:
+                        continue
+
+                    target_name = connection["node"]
+                    if target_name not in mermaid_ids:
+                        continue
+
+                    # Label the arrow with the output index if there are multiple outputs
+                    label = str(i) if len(main_connections) > 1 else None
+                    graph.add_edge(
+                        mermaid_ids[source_name], mermaid_ids[target_name], label
+                    )
+
+    return graph, passthrough
+
+
+def _bypass_passthrough_nodes(graph: _Graph, passthrough: List[str]):
+    """Remove noOp-style nodes, linking their predecessors to their successors."""
+    for node_id in passthrough:
+        incoming = [
+            (source, label)
+            for (source, target), label in graph.edges.items()
+            if target == node_id
+        ]
+        outgoing = graph.successors(node_id)
+        graph.remove_node(node_id)
+        for source, label in incoming:
+            for target in outgoing:
+                graph.add_edge(source, target, label)
+
+
+def _short_name(graph: _Graph, node_id: str) -> str:
+    return graph.labels[node_id].split("<br>")[0]
+
+
+def _collapse_chains(graph: _Graph):
+    """Collapse runs of single-input/single-output nodes into one cluster node."""
+    out_degree: Dict[str, int] = {node_id: 0 for node_id in graph.labels}
+    in_degree: Dict[str, int] = {node_id: 0 for node_id in graph.labels}
+    for source, target in graph.edges:
+        out_degree[source] += 1
+        in_degree[target] += 1
+
+    def is_link(node_id: str) -> bool:
+        return in_degree[node_id] == 1 and out_degree[node_id] == 1
+
+    visited = set()
+    for node_id in list(graph.labels):
+        if node_id in visited or not is_link(node_id):
+            continue
+        predecessor = graph.predecessors(node_id)[0]
+        if is_link(predecessor) and predecessor not in visited:
+            continue  # Not the start of the run; handled from its first link
+
+        run = []
+        current = node_id
+        while is_link(current) and current not in visited:
+            visited.add(current)
+            run.append(current)
+            current = graph.successors(current)[0]
+
+        if len(run) >= MIN_CHAIN_LENGTH:
+            label = (
+                f"{_short_name(graph, run[0])}<br>… {len(run) - 2} more steps …"
+                f"<br>{_short_name(graph, run[-1])}"
+            )
+            graph.replace_nodes(run, graph.add_cluster(label))
+
+
+def _collapse_fanouts(graph: _Graph):
+    """Group large sets of leaf successors of one node into a single cluster node."""
+    out_degree: Dict[str, int] = {node_id: 0 for node_id in graph.labels}
+    in_degree: Dict[str, int] = {node_id: 0 for node_id in graph.labels}
+    for source, target in graph.edges:
+        out_degree[source] += 1
+        in_degree[target] += 1
+
+    for node_id in list(graph.labels):
+        if node_id not in graph.labels:
+            continue
+        leaves = [
+            target
+            for target in graph.successors(node_id)
+            if out_degree.get(target) == 0 and in_degree.get(target) == 1
+        ]
+        if len(leaves) > MAX_FANOUT:
+            cluster = graph.add_cluster(f"{len(leaves)} parallel branches")
+            graph.replace_nodes(leaves, cluster)
+            out_degree[cluster], in_degree[cluster] = 0, 1
+
+
+def _enforce_budget(graph: _Graph, budget: int):
+    """Keep the first budget-1 nodes in flow order and merge the rest into one node."""
+    if len(graph.labels) <= budget:
+        return
+
+    # Breadth-first from the entry points (nodes without inputs) in workflow order
+    order = []
+    seen = set()
+    roots = [node_id for node_id in graph.labels if not graph.predecessors(node_id)]
+    for start in roots + list(graph.labels):
+        if start in seen:
+            continue
+        queue = deque([start])
+        seen.add(start)
+        while queue:
+            node_id = queue.popleft()
+            order.append(node_id)
+            for target in graph.successors(node_id):
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+
+    overflow = order[budget - 1 :]
+    graph.replace_nodes(overflow, graph.add_cluster(f"… {len(overflow)} more nodes"))
+
+
+def _render(graph: _Graph) -> str:
+    """Emit Mermaid flowchart code with shared classDef styles."""
+    mermaid_code = ["graph TD"]
+
+    members: Dict[str, List[str]] = {}
+    for node_id, node_class in graph.classes.items():
+        members.setdefault(node_class, []).append(node_id)
+    for node_class in members:
+        mermaid_code.append(f"  classDef {node_class} {CLASS_STYLES[node_class]}")
+
+    for node_id, label in graph.labels.items():
+        mermaid_code.append(f'  {node_id}["{label}"]')
+
+    for (source, target), label in graph.edges.items():
+        arrow = f" -->|{label}| " if label is not None else " --> "
+        mermaid_code.append(f"  {source}{arrow}{target}")
+
+    for node_class, node_ids in members.items():
+        mermaid_code.append(f"  class {','.join(node_ids)} {node_class}")
+
+    # Format the final mermaid diagram code
+    return "\n".join(mermaid_code)
+
+
+def generate_mermaid_diagram(
+    nodes: List[Dict], connections: Dict, detail: str = "full"
+) -> str:
+    """Generate Mermaid.js flowchart code from workflow nodes and connections.
+
+    detail is one of DETAIL_LEVELS; a level that would exceed its node budget
+    degrades to the next coarser level.
+    """
+    if detail not in DETAIL_LEVELS:
+        raise ValueError(f"Unknown diagram detail level: {detail}")
+    if not nodes:
+        return "graph TD\n  EmptyWorkflow[No nodes found in workflow]"
+    if not isinstance(connections, dict):
+        connections = {}
+
+    if detail == "full":
+        graph, _ = _build_graph(nodes, connections, drop_annotations=False)
+        if len(graph.labels) <= NODE_BUDGETS["full"]:
+            return _render(graph)
+        detail = "compact"
+
+    graph, passthrough = _build_graph(nodes, connections, drop_annotations=True)
+    if not graph.labels:
+        return "graph TD\n  EmptyWorkflow[Only annotations found in workflow]"
+    _bypass_passthrough_nodes(graph, passthrough)
+    _collapse_chains(graph)
+    if detail == "compact" and len(graph.labels) <= NODE_BUDGETS["compact"]:
+        return _render(graph)
+
+    _collapse_fanouts(graph)
+    _enforce_budget(graph, NODE_BUDGETS["overview"])
+    return _render(graph)
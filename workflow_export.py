@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Workflow Export
+Streams ZIP archives of workflow files without building them in memory.
+
+zipfile writes to a write-only buffer that cannot seek, so every entry is
+followed by a data descriptor and the bytes can be handed to the client as soon
+as each batch of files is compressed. Memory stays bounded by one batch.
+"""
+
+import zipfile
+from pathlib import Path
+from typing import List, Tuple
+
+
+class ZipStreamBuffer:
+    """Write-only file object collecting ZIP output until it is drained.
+
+    It deliberately has no tell() or seek(), which makes zipfile use its
+    streaming (data descriptor) layout.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class WorkflowZipStream:
+    """Incrementally written ZIP archive; each call returns the bytes produced.
+
+    The methods block on file I/O and compression, so async callers should run
+    them in a thread pool. Calls must not overlap.
+    """
+
+    def __init__(self, compresslevel: int = 6):
+        self._buffer = ZipStreamBuffer()
+        self._archive = zipfile.ZipFile(
+            self._buffer,
+            "w",
+            compression=zipfile.ZIP_DEFLATED,
+            compresslevel=compresslevel,
+        )
+        self.count = 0
+
+    def add_files(self, entries: List[Tuple[Path, str]]) -> bytes:
+        """Compress (path, archive name) entries and return the archive bytes so far."""
+        for path, arcname in entries:
+            try:
+                self._archive.write(path, arcname)
+                self.count += 1
+            except OSError as e:
+                # The file vanished or became unreadable since it was indexed
+                print(f"Warning: skipping {arcname} in export: {str(e)}")
+        return self._buffer.drain()
+
+    def close(self) -> bytes:
+        """Write the central directory and return the final bytes."""
+        self._archive.close()
+        return self._buffer.drain()